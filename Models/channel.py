@@ -10,6 +10,8 @@ class Channel:
     Represents a TV channel
     """
 
+    __slots__ = ("id", "name", "original_name", "logo", "group", "has_archive")
+
     def __init__(self, id, name, logo=None, group=None, has_archive=False, original_name=None):
         self.id = id
         self.name = name
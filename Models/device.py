@@ -10,6 +10,8 @@ class Device:
     Represents a registered device
     """
 
+    __slots__ = ("id", "name", "type", "is_this_device")
+
     def __init__(self, id, name, type="other", is_this_device=False):
         self.id = id
         self.name = name
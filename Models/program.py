@@ -10,6 +10,9 @@ class Program:
     Represents a TV program
     """
 
+    __slots__ = ("schedule_id", "title", "start_time", "end_time", "description",
+                 "duration", "category", "year", "episode", "images")
+
     def __init__(self, schedule_id, title, start_time, end_time,
                  description=None, duration=0, category=None,
                  year=None, episode=None, images=None):
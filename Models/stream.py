@@ -10,6 +10,8 @@ class Stream:
     Represents a media stream
     """
 
+    __slots__ = ("url", "headers", "content_type", "is_live")
+
     def __init__(self, url, headers=None, content_type=None, is_live=True):
         self.url = url
         self.headers = headers or {}
@@ -55,11 +55,19 @@ def create_app(config_file=None):
     # Create app instance
     app = Flask(__name__)
 
+    # Faster JSON encoding for API responses (orjson, if installed)
+    from api.helpers import ORJSONProvider
+    app.json = ORJSONProvider(app)
+
     # Load default configuration
     from config import load_config
     app_config = load_config(config_file)
     app.config.update(app_config)
 
+    # Hand the configuration to the service factory once
+    from Services.factory import ServiceFactory
+    ServiceFactory.configure(app.config)
+
     # Ensure data directory exists
     os.makedirs(app.config["DATA_DIR"], exist_ok=True)
 
@@ -11,6 +11,7 @@ import os
 import json
 import time
 import uuid
+import threading
 import logging
 import requests
 from urllib.parse import urlparse
@@ -37,7 +38,8 @@ class AuthService(ServiceBase):
                  system_service=None,
                  device_id=None,
                  device_name=None,
-                 device_type=None):
+                 device_type=None,
+                 language=None):
         """
         Inicializace služby pro autentizaci
 
@@ -51,6 +53,7 @@ class AuthService(ServiceBase):
             device_id (str, optional): ID zařízení nebo None pro načtení/generování
             device_name (str, optional): Název zařízení nebo None pro načtení z konfigurace
             device_type (str, optional): Typ zařízení nebo None pro načtení z konfigurace
+            language (str, optional): Kód jazyka (cz, sk) nebo None pro načtení z konfigurace
         """
         super().__init__("auth")
 
@@ -61,7 +64,7 @@ class AuthService(ServiceBase):
         self.system_service = system_service
 
         # Načtení konfigurace
-        self._load_config(username, password, device_name, device_type)
+        self._load_config(username, password, device_name, device_type, language)
 
         # Informace o zařízení
         self.device_id = device_id or self._get_device_id()
@@ -71,6 +74,10 @@ class AuthService(ServiceBase):
         self.refresh_token = None
         self.token_expires = 0
 
+        # Přihlášení a obnova tokenu probíhají vždy jen v jednom vlákně
+        # (RLock - obnova může při chybě volat přihlášení a naopak)
+        self._refresh_lock = threading.RLock()
+
         # Soubor pro uložení přihlašovacích údajů
         data_dir = self._get_data_dir()
         self.token_file = os.path.join(data_dir, f"token_{self.language}.json")
@@ -90,7 +97,7 @@ class AuthService(ServiceBase):
 
         self.logger.info(f"AuthService inicializována (jazyk: {self.language})")
 
-    def _load_config(self, username, password, device_name, device_type):
+    def _load_config(self, username, password, device_name, device_type, language=None):
         """
         Načtení konfigurace z ConfigService nebo z parametrů
 
@@ -99,12 +106,13 @@ class AuthService(ServiceBase):
             password (str): Heslo nebo None
             device_name (str): Název zařízení nebo None
             device_type (str): Typ zařízení nebo None
+            language (str): Kód jazyka nebo None
         """
         # Pokud máme ConfigService, použijeme ji pro načtení konfigurace
         if self.config_service:
             self.username = username or self.config_service.get_value("USERNAME", "")
             self.password = password or self.config_service.get_value("PASSWORD", "")
-            self.language = self.config_service.get_value("LANGUAGE", "cz").lower()
+            self.language = (language or self.config_service.get_value("LANGUAGE", "cz")).lower()
             self.device_name = device_name or self.config_service.get_value("DEVICE_NAME", "Android TV")
             self.device_type = device_type or self.config_service.get_value("DEVICE_TYPE", "OTT_STB")
             self.user_agent = self.config_service.get_value("USER_AGENT", DEFAULT_USER_AGENT)
@@ -113,7 +121,7 @@ class AuthService(ServiceBase):
             # Pokud nemáme ConfigService, použijeme parametry nebo výchozí hodnoty
             self.username = username or ""
             self.password = password or ""
-            self.language = "cz"
+            self.language = (language or "cz").lower()
             self.device_name = device_name or "Android TV"
             self.device_type = device_type or "OTT_STB"
             self.user_agent = DEFAULT_USER_AGENT
@@ -276,6 +284,16 @@ class AuthService(ServiceBase):
         """
         Přihlášení k službě MagentaTV
 
+        Returns:
+            bool: True v případě úspěšného přihlášení, jinak False
+        """
+        with self._refresh_lock:
+            return self._login()
+
+    def _login(self):
+        """
+        Přihlášení k službě MagentaTV (volá se se zámkem _refresh_lock)
+
         Returns:
             bool: True v případě úspěšného přihlášení, jinak False
         """
@@ -386,6 +404,7 @@ class AuthService(ServiceBase):
             # Zaznamenání chyby v SystemService, pokud je k dispozici
             if self.system_service:
                 self.system_service.log_error("auth", f"Chyba při přihlášení: {e}")
+                self.system_service.update_service_status("auth", "unhealthy")
 
             return False
 
@@ -393,17 +412,35 @@ class AuthService(ServiceBase):
         """
         Obnovení přístupového tokenu pomocí refresh tokenu
 
+        Souběžná volání se serializují - token obnoví jen první z nich,
+        ostatní po uvolnění zámku použijí nový token.
+
         Returns:
             bool: True v případě úspěšného obnovení tokenu, jinak False
         """
-        if not self.refresh_token:
-            self.logger.warning("Refresh token není k dispozici, je nutné se znovu přihlásit")
-            return self.login()
-
-        # Kontrola vypršení tokenu
-        if self.token_expires > time.time() + TIME_CONSTANTS["TOKEN_REFRESH_BEFORE_EXPIRY"]:
+        # Platný token - bez zámku
+        if self.refresh_token and self.token_expires > time.time() + TIME_CONSTANTS["TOKEN_REFRESH_BEFORE_EXPIRY"]:
             return True
 
+        with self._refresh_lock:
+            if not self.refresh_token:
+                self.logger.warning("Refresh token není k dispozici, je nutné se znovu přihlásit")
+                return self._login()
+
+            # Token mohlo mezitím obnovit jiné vlákno
+            if self.token_expires > time.time() + TIME_CONSTANTS["TOKEN_REFRESH_BEFORE_EXPIRY"]:
+                return True
+
+            return self._refresh_access_token()
+
+    def _refresh_access_token(self):
+        """
+        Obnovení přístupového tokenu na serveru (volá se se zámkem _refresh_lock)
+
+        Returns:
+            bool: True v případě úspěšného obnovení tokenu, jinak False
+        """
+
         # Zkusit nejprve načíst z cache, pokud máme CacheService
         if self.cache_service:
             token_data = self.cache_service.get_from_cache(f"auth_tokens_{self.language}", lambda: None)
@@ -468,9 +505,30 @@ class AuthService(ServiceBase):
             # Zaznamenání chyby v SystemService, pokud je k dispozici
             if self.system_service:
                 self.system_service.log_error("auth", f"Chyba při obnovení tokenu: {e}")
+                self.system_service.update_service_status("auth", "unhealthy")
 
             return self.login()
 
+    def invalidate_access_token(self, access_token=None):
+        """
+        Označení přístupového tokenu za neplatný (např. po odpovědi 401)
+
+        Příští volání refresh_access_token token obnoví. Pokud jiné vlákno
+        mezitím token vyměnilo, nový token zůstane beze změny.
+
+        Args:
+            access_token (str, optional): Odmítnutý token nebo None pro aktuální token
+        """
+        with self._refresh_lock:
+            if access_token is not None and access_token != self.access_token:
+                return
+
+            self.token_expires = 0
+
+            # Odmítnutý token se nesmí znovu načíst z cache
+            if self.cache_service:
+                self.cache_service.clear_cache(f"auth_tokens_{self.language}")
+
     def get_auth_headers(self):
         """
         Získání autorizačních hlaviček pro API požadavky
@@ -534,10 +592,13 @@ class AuthService(ServiceBase):
         Returns:
             dict: Stav autentizace
         """
-        token_valid = self.access_token is not None and self.token_expires > time.time()
+        token_expires = self.token_expires
+        now = time.time()
+
+        token_valid = self.access_token is not None and token_expires > now
         refresh_valid = self.refresh_token is not None
 
-        time_remaining = max(0, int(self.token_expires - time.time())) if token_valid else 0
+        time_remaining = max(0, int(token_expires - now)) if token_valid else 0
 
         return {
             "authenticated": token_valid,
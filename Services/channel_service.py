@@ -48,6 +48,11 @@ class ChannelService(AuthenticatedServiceBase):
         # Konfigurace z ConfigService
         self.cache_timeout = self._get_cache_timeout()
 
+        # Verze seznamu kanálů (mění se jen se změnou obsahu seznamu)
+        self._version = 0
+        self._last_channels = None
+        self._last_signature = None
+
         # Zaznamenání inicializace v SystemService
         if self.system_service:
             self.system_service.log_event(
@@ -88,10 +93,48 @@ class ChannelService(AuthenticatedServiceBase):
                         "channel", "cache_hit",
                         f"Kanály byly načteny z cache (počet: {len(channels)})"
                     )
-                return channels
+                return self._track_version(channels)
 
         # Pokud není cache nebo v cache nejsou data, získáme je přímo
-        return self._fetch_channels()
+        return self._track_version(self._fetch_channels())
+
+    def _track_version(self, channels):
+        """
+        Zvýšení verze, pokud se obsah seznamu kanálů změnil od posledního volání
+
+        Bez cache vrací každé volání nový seznam, proto se porovnává obsah
+        (údaje použité v playlistech), ne identita seznamu.
+
+        Args:
+            channels (list): Aktuální seznam kanálů
+
+        Returns:
+            list: Stejný seznam kanálů
+        """
+        if channels is self._last_channels:
+            return channels
+
+        signature = tuple(
+            (channel["id"], channel["name"], channel["group"], channel["logo"], channel["has_archive"])
+            for channel in channels
+        )
+        self._last_channels = channels
+        if signature != self._last_signature:
+            self._last_signature = signature
+            self._version += 1
+        return channels
+
+    def get_version(self):
+        """
+        Získání verze seznamu kanálů
+
+        Verze se mění, jen když se změní obsah seznamu kanálů (z API nebo
+        obnovené cache), takže odvozená data lze podle ní invalidovat.
+
+        Returns:
+            int: Verze seznamu kanálů vráceného posledním voláním get_channels
+        """
+        return self._version
 
     def _fetch_channels(self):
         """
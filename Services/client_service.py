@@ -26,7 +26,7 @@ class ClientService(ServiceBase):
     kompletního API rozhraní pro aplikaci.
     """
 
-    def __init__(self, username=None, password=None, language=None, quality=None):
+    def __init__(self, username=None, password=None, language=None, quality=None, auth_service=None):
         """
         Inicializace klientské služby
 
@@ -35,6 +35,7 @@ class ClientService(ServiceBase):
             password (str, optional): Heslo nebo None pro načtení z konfigurace
             language (str, optional): Kód jazyka (cz, sk) nebo None pro načtení z konfigurace
             quality (str, optional): Kvalita streamu (p1-p5) nebo None pro načtení z konfigurace
+            auth_service (AuthService, optional): Sdílená služba pro autentizaci nebo None pro vytvoření vlastní
         """
         super().__init__("client")
 
@@ -49,7 +50,7 @@ class ClientService(ServiceBase):
             quality = self._get_config("QUALITY", "p5")
 
         # Inicializace služeb
-        self.auth_service = AuthService(username, password, language)
+        self.auth_service = auth_service or AuthService(username, password, language=language)
         self.channel_service = ChannelService(self.auth_service)
         self.stream_service = StreamService(self.auth_service, quality)
         self.epg_service = EPGService(self.auth_service)
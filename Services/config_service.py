@@ -46,6 +46,13 @@ class ConfigService(ServiceBase):
         self._config = load_config(self.config_file)
         self.logger.debug("Konfigurace načtena")
 
+    def _notify_changed(self):
+        """
+        Oznámení změny konfigurace továrně služeb (zahodí uložené hodnoty)
+        """
+        from Services.factory import ServiceFactory
+        ServiceFactory.invalidate_config()
+
     def update_config(self, new_config):
         """
         Aktualizace konfigurace
@@ -58,6 +65,7 @@ class ConfigService(ServiceBase):
         """
         from config import update_config
         self._config = update_config(new_config, self.config_file)
+        self._notify_changed()
         self.logger.info(f"Konfigurace aktualizována: {list(new_config.keys())}")
         return self._config
 
@@ -100,6 +108,7 @@ class ConfigService(ServiceBase):
         # Uložení konfigurace
         from config import save_config
         result = save_config(self._config, self.config_file)
+        self._notify_changed()
 
         if result:
             self.logger.info(f"Nastavena konfigurace {key} = {value}")
@@ -118,6 +127,7 @@ class ConfigService(ServiceBase):
         from config import DEFAULT_CONFIG, save_config
         self._config = DEFAULT_CONFIG.copy()
         save_config(self._config, self.config_file)
+        self._notify_changed()
         self.logger.warning("Konfigurace resetována na výchozí hodnoty")
         return self._config
 
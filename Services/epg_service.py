@@ -3,10 +3,10 @@
 """
 EPGService - Služba pro získávání programových dat (EPG) z MagentaTV/MagioTV
 """
+import io
 import logging
 from datetime import datetime, timedelta
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import XMLGenerator
 from Models.program import Program
 from Services.base.authenticated_service_base import AuthenticatedServiceBase
 from Services.utils.constants import API_ENDPOINTS, TIME_CONSTANTS
@@ -14,6 +14,21 @@ from Services.utils.constants import API_ENDPOINTS, TIME_CONSTANTS
 logger = logging.getLogger(__name__)
 
 
+def _format_xmltv_time(value):
+    """
+    Převod času "YYYY-MM-DD HH:MM:SS" do formátu XMLTV "YYYYMMDDHHMMSS"
+
+    Vstupní formát je pevný, proto stačí vybrat číslice bez parsování.
+
+    Args:
+        value (str): Čas ve formátu "YYYY-MM-DD HH:MM:SS"
+
+    Returns:
+        str: Čas ve formátu XMLTV
+    """
+    return f"{value[0:4]}{value[5:7]}{value[8:10]}{value[11:13]}{value[14:16]}{value[17:19]}"
+
+
 class EPGService(AuthenticatedServiceBase):
     """
     Služba pro získávání a správu programových dat (EPG)
@@ -309,73 +324,100 @@ class EPGService(AuthenticatedServiceBase):
                 self.logger.error("Nelze získat EPG data pro XML export")
                 return ""
 
-            # Vytvoření kořenového elementu XML
-            root = ET.Element("tv")
-            root.set("generator-info-name", "StreamEdge")
-            root.set("generator-info-url", server_url)
+            # Průběžný zápis XML do bufferu bez stavění celého stromu
+            buffer = io.StringIO()
+            gen = XMLGenerator(buffer, "utf-8", short_empty_elements=True)
+
+            # Lokální reference na metody používané ve smyčkách
+            start_element = gen.startElement
+            end_element = gen.endElement
+            characters = gen.characters
+            whitespace = gen.ignorableWhitespace
+            format_time = _format_xmltv_time
+
+            def write_element(name, attrs=None, text=None):
+                # Zápis jednoduchého elementu (bez potomků) na druhé úrovni odsazení
+                whitespace("\n    ")
+                start_element(name, attrs or {})
+                if text is not None:
+                    characters(text)
+                end_element(name)
+
+            gen.startDocument()
+            start_element("tv", {
+                "generator-info-name": "StreamEdge",
+                "generator-info-url": server_url
+            })
+
+            # Kanály, pro které existují programy (ostatní se do XML nezapisují)
+            active_ids = {str(channel_id) for channel_id, programs in all_epg.items() if programs}
 
             # Přidání informací o kanálech
             for channel in channels:
                 channel_id = str(channel["id"])
-                channel_element = ET.SubElement(root, "channel")
-                channel_element.set("id", channel_id)
+                if channel_id not in active_ids:
+                    continue
+
+                whitespace("\n  ")
+                start_element("channel", {"id": channel_id})
 
                 # Přidání jména kanálu
-                display_name = ET.SubElement(channel_element, "display-name")
-                display_name.text = channel["name"]
+                write_element("display-name", text=channel["name"])
 
                 # Přidání ikony kanálu
                 if channel.get("logo"):
-                    icon = ET.SubElement(channel_element, "icon")
-                    icon.set("src", channel["logo"])
+                    write_element("icon", {"src": channel["logo"]})
+
+                whitespace("\n  ")
+                end_element("channel")
 
             # Přidání programů pro každý kanál
             for channel_id, programs in all_epg.items():
+                channel_id = str(channel_id)
                 for program in programs:
-                    # Vytvoření elementu programu
-                    prog_element = ET.SubElement(root, "programme")
-                    prog_element.set("channel", str(channel_id))
-
-                    # Formátování začátku a konce
-                    start = datetime.strptime(program["start_time"], "%Y-%m-%d %H:%M:%S")
-                    end = datetime.strptime(program["end_time"], "%Y-%m-%d %H:%M:%S")
+                    whitespace("\n  ")
+                    start_element("programme", {
+                        "channel": channel_id,
+                        "start": format_time(program["start_time"]),
+                        "stop": format_time(program["end_time"])
+                    })
 
-                    prog_element.set("start", start.strftime("%Y%m%d%H%M%S %z"))
-                    prog_element.set("stop", end.strftime("%Y%m%d%H%M%S %z"))
+                    get = program.get
 
                     # Přidání názvu
-                    title = ET.SubElement(prog_element, "title")
-                    title.text = program["title"]
+                    write_element("title", text=program["title"])
 
                     # Přidání popisu
-                    if program.get("description"):
-                        desc = ET.SubElement(prog_element, "desc")
-                        desc.text = program["description"]
+                    description = get("description")
+                    if description:
+                        write_element("desc", text=description)
 
                     # Přidání kategorie
-                    if program.get("category"):
-                        category = ET.SubElement(prog_element, "category")
-                        category.text = program["category"]
+                    category = get("category")
+                    if category:
+                        write_element("category", text=category)
 
                     # Přidání roku
-                    if program.get("year"):
-                        date = ET.SubElement(prog_element, "date")
-                        date.text = str(program["year"])
+                    year = get("year")
+                    if year:
+                        write_element("date", text=str(year))
 
                     # Přidání délky trvání
-                    if program.get("duration"):
-                        length = ET.SubElement(prog_element, "length")
-                        length.set("units", "seconds")
-                        length.text = str(program["duration"])
+                    duration = get("duration")
+                    if duration:
+                        write_element("length", {"units": "seconds"}, str(duration))
 
                     # Přidání obrázků
-                    for image_url in program.get("images", []):
-                        icon = ET.SubElement(prog_element, "icon")
-                        icon.set("src", image_url)
+                    for image_url in get("images", ()):
+                        write_element("icon", {"src": image_url})
+
+                    whitespace("\n  ")
+                    end_element("programme")
 
-            # Konverze XML na řetězec
-            xml_str = minidom.parseString(ET.tostring(root, 'utf-8')).toprettyxml(indent="  ")
-            return xml_str
+            whitespace("\n")
+            end_element("tv")
+            gen.endDocument()
+            return buffer.getvalue()
 
         except Exception as e:
             self.logger.error(f"Chyba při exportu EPG do XML: {e}")
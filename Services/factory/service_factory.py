@@ -3,8 +3,11 @@
 """
 ServiceFactory - Továrna pro vytváření služeb MagentaTV/MagioTV
 """
+import functools
 import logging
-from flask import current_app
+import threading
+import weakref
+from types import SimpleNamespace
 
 from Services.auth_service import AuthService
 from Services.channel_service import ChannelService
@@ -18,10 +21,56 @@ from Services.system_service import SystemService
 from Services.config_service import ConfigService
 from Services.cache_service import CacheService
 from Services.session_service import SessionService
+from Services.utils.constants import DEFAULT_USER_AGENT
 
 logger = logging.getLogger(__name__)
 
 
+def _store_weak(table, owners, key, instance):
+    """
+    Uložení instance do vnořené tabulky indexované vlastníky
+
+    Vlastníci jsou klíči vnořených WeakKeyDictionary a poslední úroveň
+    je WeakValueDictionary, takže záznam nedrží naživu vlastníky ani
+    samotnou instanci.
+
+    Args:
+        table (WeakKeyDictionary): Tabulka dané kategorie služeb
+        owners (tuple): Služby, na kterých instance závisí (např. auth_service)
+        key: Doplňující klíč (např. kvalita) nebo None
+        instance (object): Ukládaná instance
+    """
+    node = table
+    for owner in owners[:-1]:
+        try:
+            node = node[owner]
+        except KeyError:
+            child = weakref.WeakKeyDictionary()
+            node[owner] = child
+            node = child
+
+    try:
+        leaf = node[owners[-1]]
+    except KeyError:
+        leaf = weakref.WeakValueDictionary()
+        node[owners[-1]] = leaf
+    leaf[key] = instance
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_config(key, default):
+    """
+    Získání hodnoty výchozí konfigurace s memoizací
+
+    Přednost mají hodnoty předané při startu (ServiceFactory.configure),
+    ostatní se načtou z výchozí ConfigService.
+    """
+    try:
+        return ServiceFactory._config_values[key]
+    except KeyError:
+        return ServiceFactory.create_config_service().get_value(key, default)
+
+
 class ServiceFactory:
     """
     Továrna pro vytváření instancí služeb
@@ -30,7 +79,185 @@ class ServiceFactory:
     s příslušnou konfigurací a zajišťuje jejich správné propojení.
     """
 
-    _instances = {}
+    # Slabé reference - služby bez dalšího vlastníka může uvolnit garbage collector
+    _instances = weakref.WeakValueDictionary()
+    # Silné reference na parametrizované config a session služby a na AuthService
+    _pinned = []
+    # Přímé sloty pro služby bez parametrů (bez sestavování klíče)
+    _system = None
+    _cache = None
+    _default_config = None
+    _default_session = None
+    # Služby indexované přímo objekty, na kterých závisí (viz _store_weak);
+    # channel, stream, epg a device služby drží cache na AuthService (viz _get_auth_cache)
+    _cached_auths = weakref.WeakSet()
+    _catchup_by_auth = weakref.WeakKeyDictionary()
+    _playlist_by_channel = weakref.WeakKeyDictionary()
+    # Výchozí základní služby (config, cache, session, system) vyřešené najednou
+    _core_bundle = None
+
+    # Konfigurační hodnoty načtené jednorázově při startu aplikace
+    _config_values = {}
+    _CONFIG_KEYS = ("USERNAME", "PASSWORD", "LANGUAGE", "QUALITY", "USER_AGENT")
+
+    @classmethod
+    def configure(cls, config):
+        """
+        Jednorázové převzetí konfiguračních hodnot při startu aplikace
+
+        Výchozí cesty továrních metod (bez explicitní ConfigService) pak
+        čtou hodnoty z tohoto slovníku místo dotazů na ConfigService.
+        Po změně konfigurace přes ConfigService se hodnoty zahodí
+        (viz invalidate_config).
+
+        Args:
+            config (dict): Konfigurace aplikace (např. app.config)
+        """
+        cls._config_values = {key: config[key] for key in cls._CONFIG_KEYS if key in config}
+        _cached_config.cache_clear()
+        logger.debug("Konfigurace továrny služeb byla načtena")
+
+    @classmethod
+    def invalidate_config(cls):
+        """
+        Zahození konfiguračních hodnot převzatých při startu a jejich memoizace
+
+        Volá ConfigService po každém zápisu konfigurace, další volání
+        továrních metod tak čtou aktuální hodnoty z ConfigService.
+        """
+        cls._config_values = {}
+        _cached_config.cache_clear()
+        logger.debug("Konfigurační hodnoty továrny služeb byly zahozeny")
+
+    @classmethod
+    def _get_config_value(cls, key, default=None, config_service=None):
+        """
+        Získání konfigurační hodnoty
+
+        Pro výchozí ConfigService se hodnota čte přes cache (viz _cached_config),
+        jinak se čte přímo z explicitně předané ConfigService.
+
+        Args:
+            key (str): Klíč konfigurace
+            default: Výchozí hodnota, pokud klíč neexistuje
+            config_service (ConfigService, optional): Služba pro konfiguraci
+
+        Returns:
+            any: Hodnota konfigurace
+        """
+        if config_service is None or config_service is cls._default_config:
+            return _cached_config(key, default)
+
+        return config_service.get_value(key, default)
+
+    @classmethod
+    def _get_or_create(cls, instance_key, factory, pin=False):
+        """
+        Vrácení existující instance nebo její vytvoření a uložení
+
+        Args:
+            instance_key (tuple): Klíč instance v _instances
+            factory (callable): Funkce pro vytvoření nové instance
+            pin (bool): Držet na instanci silnou referenci po celou dobu běhu
+
+        Returns:
+            object: Instance služby
+        """
+        instances = cls._instances
+        try:
+            return instances[instance_key]
+        except KeyError:
+            pass
+
+        instance = factory()
+        instances[instance_key] = instance
+        if pin:
+            cls._pinned.append(instance)
+        return instance
+
+    @classmethod
+    def _get_auth_cache(cls, auth_service):
+        """
+        Získání cache služeb zavěšené přímo na instanci AuthService
+
+        Cache drží služby jen slabě, takže nebrání jejich uvolnění.
+
+        Args:
+            auth_service (AuthService): Instance služby pro autentizaci
+
+        Returns:
+            WeakValueDictionary: Služby odvozené od dané AuthService
+        """
+        try:
+            return auth_service._service_cache
+        except AttributeError:
+            auth_cache = weakref.WeakValueDictionary()
+            auth_service._service_cache = auth_cache
+            cls._cached_auths.add(auth_service)
+            return auth_cache
+
+    @classmethod
+    def _resolve_credentials(cls, username, password, language, config_service=None):
+        """
+        Doplnění přihlašovacích údajů z konfigurace
+
+        Args:
+            username (str): Přihlašovací jméno nebo None pro načtení z konfigurace
+            password (str): Heslo nebo None pro načtení z konfigurace
+            language (str): Kód jazyka nebo None pro načtení z konfigurace
+            config_service (ConfigService, optional): Služba pro konfiguraci
+
+        Returns:
+            tuple: (username, password, language)
+        """
+        if username is None:
+            username = cls._get_config_value("USERNAME", "", config_service)
+        if password is None:
+            password = cls._get_config_value("PASSWORD", "", config_service)
+        if language is None:
+            language = cls._get_config_value("LANGUAGE", "cz", config_service)
+        return username, password, language
+
+    @classmethod
+    def _ensure_core(cls, cache_service=None, session_service=None, system_service=None, config_service=None):
+        """
+        Získání nebo vytvoření základních služeb najednou
+
+        Vytvoří se jen služby, které nebyly předány. Pokud nebyla předána
+        žádná, výsledek se uloží a další volání ho vrátí bez dalšího hledání.
+
+        Args:
+            cache_service (CacheService, optional): Instance služby pro cache
+            session_service (SessionService, optional): Instance služby pro HTTP komunikaci
+            system_service (SystemService, optional): Instance služby pro monitoring
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
+
+        Returns:
+            tuple: (config_service, cache_service, session_service, system_service)
+        """
+        use_defaults = (cache_service is None and session_service is None
+                        and system_service is None and config_service is None)
+        if use_defaults and cls._core_bundle is not None:
+            return cls._core_bundle
+
+        if config_service is None:
+            config_service = cls.create_config_service()
+
+        if cache_service is None:
+            cache_service = cls.create_cache_service()
+
+        if session_service is None:
+            session_service = cls.create_session_service()
+
+        if system_service is None:
+            # Pozor na cyklickou závislost - system_service potřebuje auth_service
+            # Vytvoříme systémovou službu bez auth_service a později ji aktualizujeme
+            system_service = cls.create_system_service(None, cache_service, config_service)
+
+        core = (config_service, cache_service, session_service, system_service)
+        if use_defaults:
+            cls._core_bundle = core
+        return core
 
     @classmethod
     def initialize_core_services(cls, config_file=None):
@@ -48,7 +275,7 @@ class ServiceFactory:
         cache_service = cls.create_cache_service()
 
         # Získání User-Agent z konfigurace
-        user_agent = config_service.get_value("USER_AGENT", None)
+        user_agent = cls._get_config_value("USER_AGENT", None, config_service)
         session_service = cls.create_session_service(user_agent)
 
         # Vytvoření SystemService s referencemi na základní služby
@@ -81,21 +308,16 @@ class ServiceFactory:
         if config_service is None:
             config_service = cls.create_config_service()
 
-        # Vytvoření klíče pro instanci
-        instance_key = "system"
-
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
+        system_service = cls._system
+        if system_service is not None:
             # Aktualizace referencí, pokud je potřeba
-            system_service = cls._instances[instance_key]
             if auth_service is not None and system_service.auth_service != auth_service:
                 system_service.auth_service = auth_service
                 system_service.update_auth_status()
             return system_service
 
         # Vytvoření nové instance
-        system_service = SystemService(auth_service, cache_service, config_service)
-        cls._instances[instance_key] = system_service
+        system_service = cls._system = SystemService(auth_service, cache_service, config_service)
         return system_service
 
     @classmethod
@@ -109,17 +331,13 @@ class ServiceFactory:
         Returns:
             ConfigService: Instance služby pro správu konfigurace
         """
-        # Vytvoření klíče pro instanci
-        instance_key = f"config_{config_file}"
+        if config_file is None:
+            config_service = cls._default_config
+            if config_service is None:
+                config_service = cls._default_config = ConfigService(None)
+            return config_service
 
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
-
-        # Vytvoření nové instance
-        config_service = ConfigService(config_file)
-        cls._instances[instance_key] = config_service
-        return config_service
+        return cls._get_or_create(("config", config_file), lambda: ConfigService(config_file), pin=True)
 
     @classmethod
     def create_cache_service(cls):
@@ -129,16 +347,9 @@ class ServiceFactory:
         Returns:
             CacheService: Instance služby pro správu cache
         """
-        # Vytvoření klíče pro instanci
-        instance_key = "cache"
-
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
-
-        # Vytvoření nové instance
-        cache_service = CacheService()
-        cls._instances[instance_key] = cache_service
+        cache_service = cls._cache
+        if cache_service is None:
+            cache_service = cls._cache = CacheService()
         return cache_service
 
     @classmethod
@@ -152,33 +363,15 @@ class ServiceFactory:
         Returns:
             SessionService: Instance služby pro správu HTTP sessions
         """
-        # Použití konfigurace pro User-Agent, pokud není zadán
+        # Výchozí session (User-Agent z konfigurace nebo výchozí konstanta)
         if user_agent is None:
-            try:
-                # Nejprve zkusíme získat z ConfigService, pokud již existuje
-                config_key = "config_None"  # Výchozí klíč pro ConfigService
-                if config_key in cls._instances:
-                    config_service = cls._instances[config_key]
-                    user_agent = config_service.get_value("USER_AGENT", None)
-
-                # Jinak použijeme výchozí konstantu
-                if user_agent is None:
-                    from Services.utils.constants import DEFAULT_USER_AGENT
-                    user_agent = DEFAULT_USER_AGENT
-            except ImportError:
-                pass
-
-        # Vytvoření klíče pro instanci
-        instance_key = f"session_{user_agent}"
+            session_service = cls._default_session
+            if session_service is None:
+                user_agent = cls._get_config_value("USER_AGENT", None) or DEFAULT_USER_AGENT
+                session_service = cls._default_session = SessionService(user_agent)
+            return session_service
 
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
-
-        # Vytvoření nové instance
-        session_service = SessionService(user_agent)
-        cls._instances[instance_key] = session_service
-        return session_service
+        return cls._get_or_create(("session", user_agent), lambda: SessionService(user_agent), pin=True)
 
     @classmethod
     def create_auth_service(cls, username=None, password=None, language=None,
@@ -199,55 +392,37 @@ class ServiceFactory:
         Returns:
             AuthService: Instance služby pro autentizaci
         """
-        # Načtení konfigurace, pokud nejsou parametry zadány
-        if config_service is None:
-            config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            # Pozor na cyklickou závislost - system_service potřebuje auth_service
-            # Vytvoříme systémovou službu bez auth_service a později ji aktualizujeme
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         # Načtení parametrů z konfigurace, pokud nejsou zadány
-        if username is None:
-            username = config_service.get_value("USERNAME", "")
-        if password is None:
-            password = config_service.get_value("PASSWORD", "")
-        if language is None:
-            language = config_service.get_value("LANGUAGE", "cz")
-
-        # Vytvoření klíče pro instanci
-        instance_key = f"auth_{username}_{language}"
-
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
-
-        # Vytvoření nové instance s využitím všech dostupných služeb
-        auth_service = AuthService(
-            username=username,
-            password=password,
-            session_service=session_service,
-            config_service=config_service,
-            cache_service=cache_service,
-            system_service=system_service,
-            language=language
+        username, password, language = cls._resolve_credentials(
+            username, password, language, config_service
         )
 
-        cls._instances[instance_key] = auth_service
+        def create():
+            # Vytvoření nové instance s využitím všech dostupných služeb
+            auth_service = AuthService(
+                username=username,
+                password=password,
+                session_service=session_service,
+                config_service=config_service,
+                cache_service=cache_service,
+                system_service=system_service,
+                language=language
+            )
+
+            # Aktualizace reference v SystemService
+            if system_service and system_service.auth_service is None:
+                system_service.auth_service = auth_service
+                system_service.update_auth_status()
 
-        # Aktualizace reference v SystemService
-        if system_service and system_service.auth_service is None:
-            system_service.auth_service = auth_service
-            system_service.update_auth_status()
+            return auth_service
 
-        return auth_service
+        # AuthService se drží silně - po uvolnění by další vyhledání znamenalo nové přihlášení
+        return cls._get_or_create(("auth", username, language), create, pin=True)
 
     @classmethod
     def create_channel_service(cls, auth_service=None, cache_service=None, session_service=None,
@@ -265,18 +440,10 @@ class ServiceFactory:
         Returns:
             ChannelService: Instance služby pro kanály
         """
-        # Získání nebo vytvoření závislostí
-        if config_service is None:
-            config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         if auth_service is None:
             auth_service = cls.create_auth_service(
@@ -286,12 +453,12 @@ class ServiceFactory:
                 system_service=system_service
             )
 
-        # Vytvoření klíče pro instanci
-        instance_key = f"channel_{id(auth_service)}"
-
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        auth_cache = cls._get_auth_cache(auth_service)
+        try:
+            return auth_cache["channel"]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance s pomocnými službami
         channel_service = ChannelService(
@@ -306,12 +473,12 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("channel", channel_service)
 
-        cls._instances[instance_key] = channel_service
+        auth_cache["channel"] = channel_service
         return channel_service
 
     @classmethod
     def create_stream_service(cls, auth_service=None, cache_service=None, session_service=None,
-                              system_service=None, quality=None):
+                              system_service=None, quality=None, config_service=None):
         """
         Vytvoření instance StreamService
 
@@ -321,21 +488,15 @@ class ServiceFactory:
             session_service (SessionService, optional): Instance služby pro HTTP komunikaci
             system_service (SystemService, optional): Instance služby pro monitoring
             quality (str, optional): Kvalita streamu (p1-p5) nebo None pro načtení z konfigurace
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
 
         Returns:
             StreamService: Instance služby pro streamy
         """
-        # Získání nebo vytvoření závislostí
-        config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         if auth_service is None:
             auth_service = cls.create_auth_service(
@@ -347,14 +508,14 @@ class ServiceFactory:
 
         # Načtení kvality z konfigurace, pokud není zadána
         if quality is None:
-            quality = config_service.get_value("QUALITY", "p5")
-
-        # Vytvoření klíče pro instanci
-        instance_key = f"stream_{id(auth_service)}_{quality}"
+            quality = cls._get_config_value("QUALITY", "p5", config_service)
 
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        auth_cache = cls._get_auth_cache(auth_service)
+        try:
+            return auth_cache["stream", quality]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance - přizpůsobte podle konstruktoru StreamService
         stream_service = StreamService(auth_service, quality)
@@ -363,11 +524,12 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("stream", stream_service)
 
-        cls._instances[instance_key] = stream_service
+        auth_cache["stream", quality] = stream_service
         return stream_service
 
     @classmethod
-    def create_epg_service(cls, auth_service=None, cache_service=None, session_service=None, system_service=None):
+    def create_epg_service(cls, auth_service=None, cache_service=None, session_service=None, system_service=None,
+                           config_service=None):
         """
         Vytvoření instance EPGService
 
@@ -376,21 +538,15 @@ class ServiceFactory:
             cache_service (CacheService, optional): Instance služby pro cache
             session_service (SessionService, optional): Instance služby pro HTTP komunikaci
             system_service (SystemService, optional): Instance služby pro monitoring
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
 
         Returns:
             EPGService: Instance služby pro EPG
         """
-        # Získání nebo vytvoření závislostí
-        config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         if auth_service is None:
             auth_service = cls.create_auth_service(
@@ -400,12 +556,12 @@ class ServiceFactory:
                 system_service=system_service
             )
 
-        # Vytvoření klíče pro instanci
-        instance_key = f"epg_{id(auth_service)}"
-
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        auth_cache = cls._get_auth_cache(auth_service)
+        try:
+            return auth_cache["epg"]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance - přizpůsobte podle konstruktoru EPGService
         epg_service = EPGService(auth_service)
@@ -414,11 +570,12 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("epg", epg_service)
 
-        cls._instances[instance_key] = epg_service
+        auth_cache["epg"] = epg_service
         return epg_service
 
     @classmethod
-    def create_device_service(cls, auth_service=None, cache_service=None, session_service=None, system_service=None):
+    def create_device_service(cls, auth_service=None, cache_service=None, session_service=None, system_service=None,
+                              config_service=None):
         """
         Vytvoření instance DeviceService
 
@@ -427,21 +584,15 @@ class ServiceFactory:
             cache_service (CacheService, optional): Instance služby pro cache
             session_service (SessionService, optional): Instance služby pro HTTP komunikaci
             system_service (SystemService, optional): Instance služby pro monitoring
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
 
         Returns:
             DeviceService: Instance služby pro zařízení
         """
-        # Získání nebo vytvoření závislostí
-        config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         if auth_service is None:
             auth_service = cls.create_auth_service(
@@ -451,12 +602,12 @@ class ServiceFactory:
                 system_service=system_service
             )
 
-        # Vytvoření klíče pro instanci
-        instance_key = f"device_{id(auth_service)}"
-
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        auth_cache = cls._get_auth_cache(auth_service)
+        try:
+            return auth_cache["device"]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance - přizpůsobte podle konstruktoru DeviceService
         device_service = DeviceService(auth_service)
@@ -465,12 +616,12 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("device", device_service)
 
-        cls._instances[instance_key] = device_service
+        auth_cache["device"] = device_service
         return device_service
 
     @classmethod
     def create_catchup_service(cls, auth_service=None, epg_service=None, cache_service=None,
-                               session_service=None, system_service=None, quality=None):
+                               session_service=None, system_service=None, quality=None, config_service=None):
         """
         Vytvoření instance CatchupService
 
@@ -481,21 +632,15 @@ class ServiceFactory:
             session_service (SessionService, optional): Instance služby pro HTTP komunikaci
             system_service (SystemService, optional): Instance služby pro monitoring
             quality (str, optional): Kvalita streamu (p1-p5) nebo None pro načtení z konfigurace
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
 
         Returns:
             CatchupService: Instance služby pro archiv
         """
-        # Získání nebo vytvoření závislostí
-        config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if session_service is None:
-            session_service = cls.create_session_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
         if auth_service is None:
             auth_service = cls.create_auth_service(
@@ -510,19 +655,19 @@ class ServiceFactory:
                 auth_service,
                 cache_service,
                 session_service,
-                system_service
+                system_service,
+                config_service
             )
 
         # Načtení kvality z konfigurace, pokud není zadána
         if quality is None:
-            quality = config_service.get_value("QUALITY", "p5")
-
-        # Vytvoření klíče pro instanci
-        instance_key = f"catchup_{id(auth_service)}_{id(epg_service)}_{quality}"
+            quality = cls._get_config_value("QUALITY", "p5", config_service)
 
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        try:
+            return cls._catchup_by_auth[auth_service][epg_service][quality]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance
         catchup_service = CatchupService(auth_service, epg_service, quality)
@@ -531,7 +676,7 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("catchup", catchup_service)
 
-        cls._instances[instance_key] = catchup_service
+        _store_weak(cls._catchup_by_auth, (auth_service, epg_service), quality, catchup_service)
         return catchup_service
 
     @classmethod
@@ -549,53 +694,44 @@ class ServiceFactory:
         Returns:
             PlaylistService: Instance služby pro playlisty
         """
-        # Získání nebo vytvoření závislostí
-        config_service = cls.create_config_service()
-
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
-
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, None, system_service
+        )
 
+        # AuthService se vyřeší jen jednou a předá se kanálům i streamům
         auth_service = None
-        session_service = cls.create_session_service()
-
-        if channel_service is None:
+        if channel_service is None or stream_service is None:
             auth_service = cls.create_auth_service(
                 session_service=session_service,
                 config_service=config_service,
                 cache_service=cache_service,
                 system_service=system_service
             )
+
+        if channel_service is None:
             channel_service = cls.create_channel_service(
                 auth_service,
                 cache_service,
                 session_service,
-                system_service
+                system_service,
+                config_service
             )
 
         if stream_service is None:
-            if auth_service is None:
-                auth_service = cls.create_auth_service(
-                    session_service=session_service,
-                    config_service=config_service,
-                    cache_service=cache_service,
-                    system_service=system_service
-                )
             stream_service = cls.create_stream_service(
                 auth_service,
                 cache_service,
                 session_service,
-                system_service
+                system_service,
+                config_service=config_service
             )
 
-        # Vytvoření klíče pro instanci
-        instance_key = f"playlist_{id(channel_service)}_{id(stream_service)}"
-
         # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        try:
+            return cls._playlist_by_channel[channel_service][stream_service][None]
+        except KeyError:
+            pass
 
         # Vytvoření nové instance
         playlist_service = PlaylistService(channel_service, stream_service)
@@ -604,7 +740,7 @@ class ServiceFactory:
         if system_service:
             system_service.register_service("playlist", playlist_service)
 
-        cls._instances[instance_key] = playlist_service
+        _store_weak(cls._playlist_by_channel, (channel_service, stream_service), None, playlist_service)
         return playlist_service
 
     @classmethod
@@ -629,92 +765,218 @@ class ServiceFactory:
         Returns:
             ClientService: Instance klientské služby
         """
-        # Načtení konfigurace
-        if config_service is None:
-            config_service = cls.create_config_service()
+        # Získání nebo vytvoření základních závislostí
+        config_service, cache_service, session_service, system_service = cls._ensure_core(
+            cache_service, session_service, system_service, config_service
+        )
 
-        if cache_service is None:
-            cache_service = cls.create_cache_service()
+        # Načtení parametrů z konfigurace (create_auth_service je dostane už vyřešené)
+        username, password, language = cls._resolve_credentials(
+            username, password, language, config_service
+        )
+        if quality is None:
+            quality = cls._get_config_value("QUALITY", "p5", config_service)
 
-        if session_service is None:
-            session_service = cls.create_session_service()
+        def create():
+            # Vytvoření AuthService, který bude použit v ClientService
+            auth_service = cls.create_auth_service(
+                username,
+                password,
+                language,
+                session_service,
+                config_service,
+                cache_service,
+                system_service
+            )
 
-        if system_service is None:
-            system_service = cls.create_system_service(None, cache_service, config_service)
+            # Vytvoření nové instance se sdíleným AuthService
+            client_service = ClientService(username, password, language, quality, auth_service)
 
-        # Načtení parametrů z konfigurace
-        if username is None:
-            username = config_service.get_value("USERNAME", "")
-        if password is None:
-            password = config_service.get_value("PASSWORD", "")
-        if language is None:
-            language = config_service.get_value("LANGUAGE", "cz")
-        if quality is None:
-            quality = config_service.get_value("QUALITY", "p5")
+            # Registrace služby v SystemService
+            if system_service:
+                system_service.register_service("client", client_service)
 
-        # Vytvoření klíče pro instanci
-        instance_key = f"client_{username}_{language}_{quality}"
+            return client_service
 
-        # Kontrola, zda instance již existuje
-        if instance_key in cls._instances:
-            return cls._instances[instance_key]
+        return cls._get_or_create(("client", username, language, quality), create)
+
+    @classmethod
+    def build_all(cls, config_service=None):
+        """
+        Sestavení celého grafu služeb v jednom průchodu
+
+        Služby se vytvářejí v pořadí podle závislostí a každé tovární metodě
+        se předají již vyřešené závislosti, takže se žádná z nich neřeší
+        opakovaně. Vytvořené instance zůstávají v továrně, další volání
+        create_* je tedy jen vrátí.
+
+        Args:
+            config_service (ConfigService, optional): Instance služby pro konfiguraci
+
+        Returns:
+            SimpleNamespace: Všechny služby propojené do jednoho grafu
+        """
+        if config_service is None:
+            config_service = cls.create_config_service()
+
+        cache_service = cls.create_cache_service()
+        session_service = cls.create_session_service(cls._get_config_value("USER_AGENT", None, config_service))
+        system_service = cls.create_system_service(None, cache_service, config_service)
 
-        # Vytvoření AuthService, který bude použit v ClientService
         auth_service = cls.create_auth_service(
-            username,
-            password,
-            language,
-            session_service,
-            config_service,
-            cache_service,
-            system_service
+            session_service=session_service,
+            config_service=config_service,
+            cache_service=cache_service,
+            system_service=system_service
         )
 
-        # Vytvoření nové instance
-        # Poznámka: ClientService bude potřeba upravit, aby využíval všechny dostupné služby
-        client_service = ClientService(username, password, language, quality)
-
-        # Registrace služby v SystemService
-        if system_service:
-            system_service.register_service("client", client_service)
+        channel_service = cls.create_channel_service(
+            auth_service, cache_service, session_service, system_service, config_service
+        )
+        stream_service = cls.create_stream_service(
+            auth_service, cache_service, session_service, system_service, config_service=config_service
+        )
+        epg_service = cls.create_epg_service(
+            auth_service, cache_service, session_service, system_service, config_service
+        )
+        device_service = cls.create_device_service(
+            auth_service, cache_service, session_service, system_service, config_service
+        )
+        catchup_service = cls.create_catchup_service(
+            auth_service, epg_service, cache_service, session_service, system_service,
+            config_service=config_service
+        )
+        playlist_service = cls.create_playlist_service(
+            channel_service, stream_service, cache_service, system_service
+        )
+        client_service = cls.create_client_service(
+            config_service=config_service,
+            cache_service=cache_service,
+            session_service=session_service,
+            system_service=system_service
+        )
 
-        cls._instances[instance_key] = client_service
-        return client_service
+        logger.info("Graf služeb byl sestaven")
+        return SimpleNamespace(
+            config=config_service,
+            cache=cache_service,
+            session=session_service,
+            system=system_service,
+            auth=auth_service,
+            channel=channel_service,
+            stream=stream_service,
+            epg=epg_service,
+            device=device_service,
+            catchup=catchup_service,
+            playlist=playlist_service,
+            client=client_service
+        )
 
     @classmethod
     def clear_instances(cls):
         """
         Vyčištění všech instancí
         """
+        global _default_client
+
         # Uzavření session služeb
-        for service_name, instance in cls._instances.items():
-            if hasattr(instance, 'close') and callable(instance.close):
-                try:
-                    instance.close()
-                except Exception as e:
-                    logger.warning(f"Chyba při uzavírání instance {service_name}: {e}")
+        instances = list(cls._instances.items())
+        if cls._default_session is not None:
+            instances.append(("session", cls._default_session))
+        if cls._system is not None:
+            instances.append(("system", cls._system))
+
+        for service_name, instance in instances:
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Chyba při uzavírání instance {service_name}: {e}")
 
         # Vyčištění všech instancí
         cls._instances.clear()
+        cls._pinned.clear()
+        for by_owner in (cls._catchup_by_auth, cls._playlist_by_channel):
+            by_owner.clear()
+        for auth_service in list(cls._cached_auths):
+            del auth_service._service_cache
+        cls._cached_auths.clear()
+        cls._system = None
+        cls._cache = None
+        cls._default_config = None
+        cls._default_session = None
+        cls._core_bundle = None
+        _cached_config.cache_clear()
+        _clear_getter_caches()
+        _default_client = None
         logger.debug("Všechny instance služeb byly vymazány")
 
 
+# Výchozí instance ClientService pro volání bez parametrů: (klíč konfigurace, instance)
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def _default_client_key():
+    """
+    Klíč výchozí klientské služby podle aktuální konfigurace
+
+    Returns:
+        tuple: (username, language, quality)
+    """
+    username, _, language = ServiceFactory._resolve_credentials(None, None, None)
+    return username, language, ServiceFactory._get_config_value("QUALITY", "p5")
+
+
 # Funkce pro získání instance ClientService
 def get_magenta_tv_service():
     """
     Získání instance klientské služby MagentaTV/MagioTV
 
+    Instance se drží v modulové proměnné spolu s konfigurací, ze které
+    vznikla; po změně přihlašovacího jména, jazyka nebo kvality se
+    vytvoří nová.
+
     Returns:
         ClientService: Instance klientské služby
     """
-    try:
-        return ServiceFactory.create_client_service()
-    except Exception as e:
-        logger.error(f"Chyba při vytváření klientské služby: {e}")
-        return None
+    global _default_client
+
+    key = _default_client_key()
+    cached = _default_client
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _default_client_lock:
+        cached = _default_client
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        try:
+            client = ServiceFactory.create_client_service()
+        except Exception as e:
+            logger.error(f"Chyba při vytváření klientské služby: {e}")
+            return None
+
+        _default_client = (key, client)
+        return client
+
+
+def clear_magenta_tv_service():
+    """
+    Zahození výchozí instance klientské služby
+    """
+    global _default_client
+
+    with _default_client_lock:
+        _default_client = None
 
 
 # Globální funkce pro přístup k základním službám
+@functools.cache
 def get_config_service():
     """
     Získání globální instance ConfigService
@@ -725,6 +987,7 @@ def get_config_service():
     return ServiceFactory.create_config_service()
 
 
+@functools.cache
 def get_cache_service():
     """
     Získání globální instance CacheService
@@ -735,6 +998,7 @@ def get_cache_service():
     return ServiceFactory.create_cache_service()
 
 
+@functools.cache
 def get_session_service():
     """
     Získání globální instance SessionService
@@ -745,6 +1009,7 @@ def get_session_service():
     return ServiceFactory.create_session_service()
 
 
+@functools.cache
 def get_system_service():
     """
     Získání globální instance SystemService
@@ -755,6 +1020,14 @@ def get_system_service():
     return ServiceFactory.create_system_service()
 
 
+def _clear_getter_caches():
+    """
+    Vyčištění memoizovaných globálních getterů základních služeb
+    """
+    for getter in (get_config_service, get_cache_service, get_session_service, get_system_service):
+        getter.cache_clear()
+
+
 def initialize_services(config_file=None):
     """
     Inicializace všech základních služeb
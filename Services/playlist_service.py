@@ -8,6 +8,14 @@ from Services.base.service_base import ServiceBase
 
 logger = logging.getLogger(__name__)
 
+# Šablony řádků playlistu (doplňuje se jen URL serveru a ID kanálu)
+_CATCHUP_TMPL = ' catchup="default" catchup-source="%s/api/catchup/%s/${start}-${end}" catchup-days="7"'
+_STREAM_TMPL = "%s/api/stream/%s?redirect=1\n"
+_ERROR_URL = "http://127.0.0.1/error.m3u8\n"
+
+# Maximální počet uložených vygenerovaných playlistů
+_PLAYLIST_CACHE_SIZE = 8
+
 
 class PlaylistService(ServiceBase):
     """
@@ -26,6 +34,44 @@ class PlaylistService(ServiceBase):
         self.channel_service = channel_service
         self.stream_service = stream_service
 
+        # Vygenerované playlisty: (druh, server_url) -> (verze kanálů, výsledek)
+        self._playlist_cache = {}
+        # Fragmenty kanálů nezávislé na URL serveru: (verze kanálů, (fragmenty, skupiny))
+        self._fragments = None
+
+    def _get_cached(self, kind, server_url, render, channels):
+        """
+        Získání vygenerovaného playlistu z cache nebo jeho vytvoření
+
+        Playlisty bez server_url obsahují přímé (časově omezené) URL streamů,
+        proto se necachují. Slovníkové výsledky se vracejí jako mělká kopie,
+        aby úprava u volajícího nepoškodila cache (hodnoty jsou neměnné řetězce).
+
+        Args:
+            kind (str): Druh playlistu
+            server_url (str): URL serveru pro přesměrování
+            render (callable): Funkce render(channels, server_url) pro vytvoření playlistu
+            channels (list): Seznam kanálů
+
+        Returns:
+            str | dict: Vygenerovaný playlist
+        """
+        if not server_url:
+            return render(channels, server_url)
+
+        version = self.channel_service.get_version()
+        key = (kind, server_url)
+        hit = self._playlist_cache.get(key)
+        if hit is not None and hit[0] == version:
+            result = hit[1]
+        else:
+            result = render(channels, server_url)
+            if len(self._playlist_cache) >= _PLAYLIST_CACHE_SIZE:
+                self._playlist_cache.clear()
+            self._playlist_cache[key] = (version, result)
+
+        return dict(result) if isinstance(result, dict) else result
+
     def generate_m3u_playlist(self, server_url=""):
         """
         Vygenerování M3U playlistu pro použití v IPTV přehrávačích
@@ -40,39 +86,141 @@ class PlaylistService(ServiceBase):
         if not channels:
             return ""
 
-        playlist = "#EXTM3U\n"
+        return self._get_cached("m3u", server_url, self._render_m3u_playlist, channels)
 
-        for channel in channels:
-            channel_id = channel["id"]
-            name = channel["name"].replace(" HD", "")
-            group = channel["group"]
-            logo = channel["logo"]
-            has_archive = channel["has_archive"]
+    def _render_m3u_playlist(self, channels, server_url):
+        """
+        Sestavení M3U playlistu s metadaty
+
+        Args:
+            channels (list): Seznam kanálů
+            server_url (str): URL serveru pro přesměrování
+
+        Returns:
+            str: Obsah M3U playlistu
+        """
+        fragments = self._get_channel_fragments(channels)[0]
+        return self._join_fragments(fragments, server_url, self._prefetch_streams(fragments, server_url))
+
+    def _prefetch_streams(self, fragments, server_url):
+        """
+        Souběžné získání URL streamů pro playlist bez URL serveru
+
+        Args:
+            fragments (list): Fragmenty kanálů
+            server_url (str): URL serveru pro přesměrování
+
+        Returns:
+            dict: ID kanálu -> informace o streamu, nebo None pokud je zadána URL serveru
+        """
+        if server_url:
+            return None
+        return self.stream_service.get_live_streams(fragment["id"] for fragment in fragments)
+
+    def _join_fragments(self, fragments, server_url, streams=None):
+        """
+        Spojení předpřipravených fragmentů kanálů do M3U playlistu
+
+        Args:
+            fragments (list): Fragmenty kanálů (viz _build_channel_fragments)
+            server_url (str): URL serveru pro přesměrování
+            streams (dict, optional): Předem získané streamy (viz _prefetch_streams)
+
+        Returns:
+            str: Obsah M3U playlistu
+        """
+        parts = ["#EXTM3U\n"]
+
+        for fragment in fragments:
+            channel_id = fragment["id"]
 
             # Zápis informací o kanálu
-            playlist += f'#EXTINF:-1 tvg-id="{channel_id}" tvg-name="{name}" group-title="{group}"'
+            parts.append(fragment["extinf"])
 
             # Přidání informací o archivu, pokud je dostupný
-            if has_archive and server_url:
-                playlist += f' catchup="default" catchup-source="{server_url}/api/catchup/{channel_id}/' + '${start}-${end}' + '" catchup-days="7"'
+            if fragment["has_archive"] and server_url:
+                parts.append(_CATCHUP_TMPL % (server_url, channel_id))
 
-            # Přidání loga, pokud je dostupné
-            if logo:
-                playlist += f' tvg-logo="{logo}"'
-
-            playlist += f',{name}\n'
+            # Logo a název kanálu
+            parts.append(fragment["extinf_tail"])
 
             # URL pro streamování
-            if server_url:
-                playlist += f'{server_url}/api/stream/{channel_id}?redirect=1\n'
-            else:
-                stream_info = self.stream_service.get_live_stream(channel_id)
-                if stream_info:
-                    playlist += f'{stream_info["url"]}\n'
-                else:
-                    playlist += f'http://127.0.0.1/error.m3u8\n'
+            parts.append(self._get_stream_line(channel_id, server_url, streams))
+
+        return "".join(parts)
+
+    def _get_channel_fragments(self, channels):
+        """
+        Získání fragmentů kanálů, sestavených jednou pro každou verzi seznamu kanálů
 
-        return playlist
+        Args:
+            channels (list): Seznam kanálů
+
+        Returns:
+            tuple: (seznam fragmentů, slovník skupina -> seznam fragmentů)
+        """
+        version = self.channel_service.get_version()
+        cached = self._fragments
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        fragments = self._build_channel_fragments(channels)
+        groups = {}
+        for fragment in fragments:
+            groups.setdefault(fragment["group"], []).append(fragment)
+
+        self._fragments = (version, (fragments, groups))
+        return fragments, groups
+
+    @staticmethod
+    def _build_channel_fragments(channels):
+        """
+        Předpřipravení částí playlistu, které nezávisí na URL serveru
+
+        Args:
+            channels (list): Seznam kanálů
+
+        Returns:
+            list: Fragmenty kanálů (slovníky s klíči id, group, has_archive,
+            extinf, extinf_tail a simple)
+        """
+        fragments = []
+        for channel in channels:
+            channel_id = channel["id"]
+            name = channel["name"].replace(" HD", "")
+            group = channel["group"]
+            logo = channel["logo"]
+            logo_attr = f' tvg-logo="{logo}"' if logo else ""
+
+            fragments.append({
+                "id": channel_id,
+                "group": group,
+                "has_archive": channel["has_archive"],
+                "extinf": f'#EXTINF:-1 tvg-id="{channel_id}" tvg-name="{name}" group-title="{group}"',
+                "extinf_tail": f'{logo_attr},{name}\n',
+                "simple": f'#EXTINF:-1,{channel["name"]}\n',
+            })
+        return fragments
+
+    def _get_stream_line(self, channel_id, server_url, streams):
+        """
+        Sestavení řádku s URL streamu pro playlist
+
+        Args:
+            channel_id (str): ID kanálu
+            server_url (str): URL serveru pro přesměrování
+            streams (dict): Předem získané streamy (použijí se bez URL serveru)
+
+        Returns:
+            str: Řádek s URL streamu včetně konce řádku
+        """
+        if server_url:
+            return _STREAM_TMPL % (server_url, channel_id)
+
+        stream_info = streams.get(channel_id)
+        if stream_info:
+            return f'{stream_info["url"]}\n'
+        return _ERROR_URL
 
     def get_epg_xml(self, server_url="", days=3, epg_service=None):
         """
@@ -109,26 +257,31 @@ class PlaylistService(ServiceBase):
         if not channels:
             return ""
 
-        playlist = "#EXTM3U\n"
+        return self._get_cached("simple", server_url, self._render_simple_m3u, channels)
 
-        for channel in channels:
-            channel_id = channel["id"]
-            name = channel["name"]
+    def _render_simple_m3u(self, channels, server_url):
+        """
+        Sestavení jednoduchého M3U playlistu
+
+        Args:
+            channels (list): Seznam kanálů
+            server_url (str): URL serveru pro přesměrování
+
+        Returns:
+            str: Obsah jednoduchého M3U playlistu
+        """
+        parts = ["#EXTM3U\n"]
+        fragments = self._get_channel_fragments(channels)[0]
+        streams = self._prefetch_streams(fragments, server_url)
 
+        for fragment in fragments:
             # Základní zápis informací o kanálu
-            playlist += f'#EXTINF:-1,{name}\n'
+            parts.append(fragment["simple"])
 
             # URL pro streamování
-            if server_url:
-                playlist += f'{server_url}/api/stream/{channel_id}?redirect=1\n'
-            else:
-                stream_info = self.stream_service.get_live_stream(channel_id)
-                if stream_info:
-                    playlist += f'{stream_info["url"]}\n'
-                else:
-                    playlist += f'http://127.0.0.1/error.m3u8\n'
+            parts.append(self._get_stream_line(fragment["id"], server_url, streams))
 
-        return playlist
+        return "".join(parts)
 
     def generate_by_groups(self, server_url=""):
         """
@@ -144,48 +297,26 @@ class PlaylistService(ServiceBase):
         if not channels:
             return {}
 
-        # Rozdělení kanálů podle skupin
-        groups = {}
-        for channel in channels:
-            group = channel["group"]
-            if group not in groups:
-                groups[group] = []
-            groups[group].append(channel)
+        return self._get_cached("groups", server_url, self._render_by_groups, channels)
+
+    def _render_by_groups(self, channels, server_url):
+        """
+        Sestavení M3U playlistů pro jednotlivé skupiny kanálů
+
+        Args:
+            channels (list): Seznam kanálů
+            server_url (str): URL serveru pro přesměrování
+
+        Returns:
+            dict: Slovník s playlistem pro každou skupinu
+        """
+        fragments, groups = self._get_channel_fragments(channels)
+
+        # Streamy všech kanálů se bez URL serveru získají najednou a souběžně
+        streams = self._prefetch_streams(fragments, server_url)
 
         # Generování playlistu pro každou skupinu
-        playlists = {}
-        for group, group_channels in groups.items():
-            playlist = "#EXTM3U\n"
-
-            for channel in group_channels:
-                channel_id = channel["id"]
-                name = channel["name"].replace(" HD", "")
-                logo = channel["logo"]
-                has_archive = channel["has_archive"]
-
-                # Zápis informací o kanálu
-                playlist += f'#EXTINF:-1 tvg-id="{channel_id}" tvg-name="{name}" group-title="{group}"'
-
-                # Přidání informací o archivu, pokud je dostupný
-                if has_archive and server_url:
-                    playlist += f' catchup="default" catchup-source="{server_url}/api/catchup/{channel_id}/' + '${start}-${end}' + '" catchup-days="7"'
-
-                # Přidání loga, pokud je dostupné
-                if logo:
-                    playlist += f' tvg-logo="{logo}"'
-
-                playlist += f',{name}\n'
-
-                # URL pro streamování
-                if server_url:
-                    playlist += f'{server_url}/api/stream/{channel_id}?redirect=1\n'
-                else:
-                    stream_info = self.stream_service.get_live_stream(channel_id)
-                    if stream_info:
-                        playlist += f'{stream_info["url"]}\n'
-                    else:
-                        playlist += f'http://127.0.0.1/error.m3u8\n'
-
-            playlists[group] = playlist
-
-        return playlists
\ No newline at end of file
+        return {
+            group: self._join_fragments(group_fragments, server_url, streams)
+            for group, group_fragments in groups.items()
+        }
@@ -4,13 +4,30 @@
 SessionService - Služba pro správu HTTP sessions a requestů
 """
 import logging
+import threading
+import time
 import requests
-from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from Services.base.service_base import ServiceBase
 from Services.utils.constants import DEFAULT_USER_AGENT, TIME_CONSTANTS
 
+try:
+    import orjson as _json
+except ImportError:
+    # orjson je volitelná závislost, bez ní se použije standardní json
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Velikost poolu spojení (počet hostitelů / spojení na hostitele)
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
+# Cache cílových URL přesměrování (platnost v sekundách, maximální počet záznamů)
+_REDIRECT_TTL = 60
+_REDIRECT_CACHE_SIZE = 512
+
 
 class SessionService(ServiceBase):
     """
@@ -28,7 +45,23 @@ class SessionService(ServiceBase):
         self.user_agent = user_agent or DEFAULT_USER_AGENT
         self.session = requests.Session()
 
-        # Nastavení základních hlaviček
+        # Výchozí timeouty
+        self._default_timeout = TIME_CONSTANTS["DEFAULT_TIMEOUT"]
+        self._stream_timeout = TIME_CONSTANTS["STREAM_TIMEOUT"]
+
+        # Cache přesměrování: klíč -> (čas uložení, cílová URL)
+        self._redirect_cache = {}
+        self._redirect_lock = threading.Lock()
+
+        # Větší pool keep-alive spojení pro souběžné požadavky na stejné hostitele,
+        # s opakováním při přechodných chybách serveru (urllib3 neopakuje POST)
+        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Nastavení základních hlaviček - requests je sloučí s hlavičkami každého
+        # požadavku (Accept a Accept-Encoding doplňuje Session sama)
         self.session.headers.update({
             "User-Agent": self.user_agent
         })
@@ -49,20 +82,13 @@ class SessionService(ServiceBase):
             Response: Odpověď na požadavek nebo None při chybě
         """
         if timeout is None:
-            timeout = TIME_CONSTANTS["DEFAULT_TIMEOUT"]
-
-        # Výchozí hlavičky pro doménu
-        request_headers = self._prepare_headers(url)
-
-        # Přidání vlastních hlaviček
-        if headers:
-            request_headers.update(headers)
+            timeout = self._default_timeout
 
         try:
             response = self.session.get(
                 url,
                 params=params,
-                headers=request_headers,
+                headers=headers,
                 timeout=timeout,
                 stream=stream,
                 allow_redirects=allow_redirects
@@ -92,18 +118,13 @@ class SessionService(ServiceBase):
             Response: Odpověď na požadavek nebo None při chybě
         """
         if timeout is None:
-            timeout = TIME_CONSTANTS["DEFAULT_TIMEOUT"]
-
-        # Výchozí hlavičky pro doménu
-        request_headers = self._prepare_headers(url)
+            timeout = self._default_timeout
 
-        # Nastavení hlavičky Content-Type pro JSON data
-        if json and "Content-Type" not in request_headers:
-            request_headers["Content-Type"] = "application/json"
-
-        # Přidání vlastních hlaviček
-        if headers:
-            request_headers.update(headers)
+        # Serializace JSON dat (Content-Type může přepsat volající)
+        if json is not None and data is None:
+            data = _json.dumps(json)
+            headers = {"Content-Type": "application/json", **(headers or {})}
+            json = None
 
         try:
             response = self.session.post(
@@ -111,7 +132,7 @@ class SessionService(ServiceBase):
                 data=data,
                 json=json,
                 params=params,
-                headers=request_headers,
+                headers=headers,
                 timeout=timeout
             )
 
@@ -152,8 +173,16 @@ class SessionService(ServiceBase):
         Returns:
             str: Cílová URL po přesměrování nebo None při chybě
         """
+        # Cíl přesměrování bývá několik minut stejný - krátkodobá cache
+        cache_key = (url, tuple(sorted(headers.items())) if headers else ())
+        now = time.monotonic()
+        with self._redirect_lock:
+            cached = self._redirect_cache.get(cache_key)
+        if cached is not None and now - cached[0] < _REDIRECT_TTL:
+            return cached[1]
+
         if timeout is None:
-            timeout = TIME_CONSTANTS["STREAM_TIMEOUT"]
+            timeout = self._stream_timeout
 
         response = self.get(url, headers=headers, allow_redirects=False, timeout=timeout)
 
@@ -162,9 +191,22 @@ class SessionService(ServiceBase):
 
         # Získání cílové URL z hlavičky Location
         if response.status_code in (301, 302, 303, 307, 308):
-            return response.headers.get("Location", url)
-
-        return url
+            target_url = response.headers.get("Location", url)
+        else:
+            target_url = url
+
+        with self._redirect_lock:
+            if len(self._redirect_cache) >= _REDIRECT_CACHE_SIZE:
+                # Odstranění prošlých záznamů, případně vyprázdnění celé cache
+                self._redirect_cache = {
+                    key: entry for key, entry in self._redirect_cache.items()
+                    if now - entry[0] < _REDIRECT_TTL
+                }
+                if len(self._redirect_cache) >= _REDIRECT_CACHE_SIZE:
+                    self._redirect_cache.clear()
+            self._redirect_cache[cache_key] = (now, target_url)
+
+        return target_url
 
     def get_json(self, url, params=None, headers=None, timeout=None):
         """
@@ -185,7 +227,7 @@ class SessionService(ServiceBase):
             return None
 
         try:
-            return response.json()
+            return _json.loads(response.content)
         except ValueError as e:
             self.logger.error(f"Chyba při parsování JSON odpovědi: {e}")
             return None
@@ -211,36 +253,11 @@ class SessionService(ServiceBase):
             return None
 
         try:
-            return response.json()
+            return _json.loads(response.content)
         except ValueError as e:
             self.logger.error(f"Chyba při parsování JSON odpovědi: {e}")
             return None
 
-    def _prepare_headers(self, url):
-        """
-        Příprava hlaviček na základě URL
-
-        Args:
-            url (str): URL
-
-        Returns:
-            dict: Hlavičky přizpůsobené pro danou URL
-        """
-        headers = {}
-
-        # Přidání Host hlavičky
-        try:
-            parsed_url = urlparse(url)
-            if parsed_url.netloc:
-                headers["Host"] = parsed_url.netloc
-        except Exception:
-            pass
-
-        # Přidání User-Agent
-        headers["User-Agent"] = self.user_agent
-
-        return headers
-
     def close(self):
         """
         Uzavření session
@@ -4,13 +4,28 @@
 StreamService - Služba pro získávání streamů z MagentaTV/MagioTV
 """
 import logging
-from urllib.parse import urlparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from Models.stream import Stream
 from Services.base.authenticated_service_base import AuthenticatedServiceBase
 from Services.utils.constants import TIME_CONSTANTS
 
+try:
+    import orjson as _json
+except ImportError:
+    # orjson je volitelná závislost, bez ní se použije standardní json
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Maximální počet souběžně získávaných streamů v get_live_streams
+_MAX_STREAM_WORKERS = 16
+
+# Doba platnosti (s) a maximální počet uložených URL živých streamů
+_STREAM_CACHE_TTL = 60
+_STREAM_CACHE_SIZE = 512
+
 
 class StreamService(AuthenticatedServiceBase):
     """
@@ -26,33 +41,26 @@ class StreamService(AuthenticatedServiceBase):
             quality (str): Kvalita streamu (p1-p5, kde p5 je nejvyšší)
         """
         super().__init__("stream", auth_service)
-        self.session = auth_service.session
-        self.base_url = auth_service.get_base_url()
-        self.language = auth_service.language
         self.quality = quality
-        self.device_name = auth_service.device_name
-        self.device_type = auth_service.device_type
-
-    def get_live_stream(self, channel_id):
-        """
-        Získání URL pro streamování živého vysílání kanálu
 
-        Args:
-            channel_id (int): ID kanálu
+        # Krátkodobá cache URL streamů: ID kanálu -> (čas uložení, stream);
+        # kvalita je daná instancí, hlavičky streamu nesou token, se kterým byl získán
+        self._stream_cache = {}
+        self._stream_lock = threading.Lock()
 
-        Returns:
-            dict: Informace o streamu včetně URL nebo None v případě chyby
-        """
-        # Získání autorizačních hlaviček
-        headers = self._get_auth_headers()
-        if not headers:
-            return None
+        self.session = self.auth_service.session
+        self.base_url = self.auth_service.get_base_url()
+        self.language = self.auth_service.language
+        self.device_name = self.auth_service.device_name
+        self.device_type = self.auth_service.device_type
 
-        params = {
+        # Části požadavku nezávislé na kanálu
+        self._stream_url = f"{self.base_url}/v2/television/stream-url"
+        self._referer = f"https://{self.language}go.magio.tv/"
+        self._params_template = {
             "service": "LIVE",
             "name": self.device_name,
             "devtype": self.device_type,
-            "id": int(channel_id),
             "prof": self.quality,
             "ecid": "",
             "drm": "widevine",
@@ -61,19 +69,133 @@ class StreamService(AuthenticatedServiceBase):
             "device": "OTT_PC_HD_1080p_v2"
         }
 
+        # (platnost do, přístupový token, hlavičky pro API, základ hlaviček pro přesměrování)
+        self._auth = None
+
+    def _auth_snapshot(self):
+        """
+        Získání autorizačních hlaviček z cache platné do blížícího se vypršení tokenu
+
+        Hlavičky se sestaví znovu po vypršení tokenu (AuthService jej při tom
+        případně obnoví) nebo když AuthService mezitím token vyměnila.
+
+        Returns:
+            tuple: (hlavičky pro API, základ hlaviček pro přesměrování) nebo None při chybě
+        """
+        snapshot = self._auth
+        if (snapshot is not None and snapshot[0] > time.time()
+                and snapshot[1] == self.auth_service.access_token):
+            return snapshot[2], snapshot[3]
+
+        headers = self._get_auth_headers()
+        if not headers:
+            return None
+
+        referer = self._referer
         stream_headers = {
             **headers,
             "Accept": "*/*",
-            "Referer": f"https://{self.language}go.magio.tv/"
+            "Referer": referer
         }
+        access_token = self.auth_service.access_token
+        redirect_headers = {
+            "User-Agent": self.auth_service.user_agent,
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "*/*",
+            "Referer": referer
+        }
+
+        valid_until = self.auth_service.token_expires - TIME_CONSTANTS["TOKEN_REFRESH_BEFORE_EXPIRY"]
+        self._auth = (valid_until, access_token, stream_headers, redirect_headers)
+        return stream_headers, redirect_headers
+
+    def _invalidate_auth(self):
+        """
+        Zahození uložených hlaviček a vynucení obnovy tokenu po odmítnutí serverem
+        """
+        snapshot = self._auth
+        self._auth = None
+        self.auth_service.invalidate_access_token(snapshot[1] if snapshot is not None else None)
+
+    def get_live_stream(self, channel_id):
+        """
+        Získání URL pro streamování živého vysílání kanálu
+
+        URL streamů jsou platné několik minut, proto se výsledek krátce cachuje.
+        Po výměně přístupového tokenu se cache zahodí, aby se nevracely
+        hlavičky se starým tokenem.
+
+        Args:
+            channel_id (int): ID kanálu
+
+        Returns:
+            dict: Informace o streamu včetně URL nebo None v případě chyby
+        """
+        auth = self._auth_snapshot()
+        if not auth:
+            return None
+        authorization = auth[1]["Authorization"]
+
+        now = time.monotonic()
+        with self._stream_lock:
+            cached = self._stream_cache.get(channel_id)
+            if cached is not None and cached[1]["headers"].get("Authorization") != authorization:
+                # Token se mezitím vyměnil - uložené streamy patří starému tokenu
+                self._stream_cache.clear()
+                cached = None
+        if cached is not None and now - cached[0] < _STREAM_CACHE_TTL:
+            return {**cached[1], "headers": dict(cached[1]["headers"])}
+
+        stream = self._fetch_live_stream(channel_id)
+        if stream is None:
+            return None
+
+        with self._stream_lock:
+            if len(self._stream_cache) >= _STREAM_CACHE_SIZE:
+                # Odstranění prošlých záznamů, případně vyprázdnění celé cache
+                self._stream_cache = {
+                    key: entry for key, entry in self._stream_cache.items()
+                    if now - entry[0] < _STREAM_CACHE_TTL
+                }
+                if len(self._stream_cache) >= _STREAM_CACHE_SIZE:
+                    self._stream_cache.clear()
+            self._stream_cache[channel_id] = (now, stream)
+
+        return {**stream, "headers": dict(stream["headers"])}
+
+    def _fetch_live_stream(self, channel_id, _retry=True):
+        """
+        Získání URL živého streamu z API
+
+        Args:
+            channel_id (int): ID kanálu
+            _retry (bool): Povolit opakování po odmítnutí tokenu (interní)
+
+        Returns:
+            dict: Informace o streamu včetně URL nebo None v případě chyby
+        """
+        # Získání autorizačních hlaviček
+        auth = self._auth_snapshot()
+        if not auth:
+            return None
+        stream_headers, redirect_headers = auth
+
+        params = {**self._params_template, "id": int(channel_id)}
 
         try:
             response = self.session.get(
-                f"{self.base_url}/v2/television/stream-url",
+                self._stream_url,
                 params=params,
                 headers=stream_headers,
                 timeout=TIME_CONSTANTS["STREAM_TIMEOUT"]
-            ).json()
+            )
+
+            # Odmítnutý token - jeden pokus znovu s obnoveným tokenem
+            if response.status_code == 401 and _retry:
+                self._invalidate_auth()
+                return self._fetch_live_stream(channel_id, _retry=False)
+
+            response = _json.loads(response.content)
 
             if not response.get("success", False):
                 error_msg = response.get('errorMessage', 'Neznámá chyba')
@@ -82,28 +204,29 @@ class StreamService(AuthenticatedServiceBase):
 
             url = response["url"]
 
-            # Následování přesměrování pro získání skutečné URL
-            headers_redirect = {
-                "Host": urlparse(url).netloc,
-                "User-Agent": self.auth_service.user_agent,
-                "Authorization": f"Bearer {self.auth_service.access_token}",
-                "Accept": "*/*",
-                "Referer": f"https://{self.language}go.magio.tv/"
-            }
-
-            redirect_response = self.session.get(
+            # Následování přesměrování pro získání skutečné URL (stačí hlavičky, tělo se nestahuje);
+            # hlavičku Host doplní urllib3 z URL
+            redirect_response = self.session.head(
                 url,
-                headers=headers_redirect,
+                headers=redirect_headers,
                 allow_redirects=False,
                 timeout=TIME_CONSTANTS["STREAM_TIMEOUT"]
             )
+            if redirect_response.status_code in (405, 501):
+                # Server nepodporuje HEAD
+                redirect_response = self.session.get(
+                    url,
+                    headers=redirect_headers,
+                    allow_redirects=False,
+                    timeout=TIME_CONSTANTS["STREAM_TIMEOUT"]
+                )
 
             final_url = redirect_response.headers.get("location", url)
 
             # Vytvoření objektu Stream
             stream = Stream(
                 url=final_url,
-                headers=dict(headers_redirect),
+                headers=redirect_headers,
                 content_type=redirect_response.headers.get("Content-Type", "application/vnd.apple.mpegurl"),
                 is_live=True
             )
@@ -112,4 +235,30 @@ class StreamService(AuthenticatedServiceBase):
 
         except Exception as e:
             self.logger.error(f"Chyba při získání stream URL: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_live_streams(self, channel_ids):
+        """
+        Získání URL streamů pro více kanálů najednou
+
+        Požadavky pro jednotlivé kanály běží souběžně nad sdíleným poolem
+        spojení, takže celková doba odpovídá přibližně nejpomalejšímu kanálu.
+        Token se případně obnoví jednou předem ve volajícím vlákně.
+
+        Args:
+            channel_ids (iterable): ID kanálů
+
+        Returns:
+            dict: ID kanálu -> informace o streamu (nebo None v případě chyby)
+        """
+        channel_ids = list(channel_ids)
+        if not channel_ids:
+            return {}
+
+        # Bez platných hlaviček nemá smysl spouštět souběžné požadavky
+        if self._auth_snapshot() is None:
+            return dict.fromkeys(channel_ids)
+
+        workers = min(_MAX_STREAM_WORKERS, len(channel_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(channel_ids, executor.map(self.get_live_stream, channel_ids)))
@@ -8,17 +8,32 @@ a diagnostiku různých komponent aplikace. Centralizuje sběr informací
 o běžících službách, sleduje chyby a poskytuje přehled o stavu systému.
 """
 import time
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import itertools
 import sys
 import platform
 import json
+from collections import deque
 from datetime import datetime, timedelta
 from threading import Lock
 from Services.base.service_base import ServiceBase
 
 logger = logging.getLogger(__name__)
 
+# Maximální velikost systémového logu a počet zálohovaných souborů
+_SYSTEM_LOG_MAX_BYTES = 10 * 1024 * 1024
+_SYSTEM_LOG_BACKUPS = 7
+
+# Doba (s), po kterou se znovu použije naměřené využití paměti
+_MEMORY_INFO_TTL = 1.0
+
+# Doba (s), po kterou se znovu použije výsledek stavových dotazů (auth, cache, systém)
+_STATUS_CACHE_TTL = 1.0
+
 
 class SystemService(ServiceBase):
     """
@@ -45,14 +60,33 @@ class SystemService(ServiceBase):
 
         # Monitoring
         self.services = {}  # Registrované služby
-        self.errors = []  # Poslední chyby
-        self.events = []  # Události systému
         self.max_errors = 100  # Maximální počet chyb v historii
         self.max_events = 200  # Maximální počet událostí v historii
+        self.errors = deque(maxlen=self.max_errors)  # Poslední chyby
+        self.events = deque(maxlen=self.max_events)  # Události systému
 
-        # Zámek pro přístup k historii chyb a událostí
+        # Zámek pro zápis do historie chyb a událostí
         self._history_lock = Lock()
 
+        # Neměnné kopie historie pro čtení bez zámku (None = neaktuální)
+        self._errors_snapshot = None
+        self._events_snapshot = None
+
+        # Údaje o systému, které se za běhu procesu nemění
+        self._static_system_info = {
+            "platform": platform.platform(),
+            "python_version": platform.python_version(),
+            "hostname": platform.node(),
+            "cpu_count": os.cpu_count() or 0
+        }
+
+        # Výsledky stavových dotazů: název -> (čas, hodnota)
+        self._status_cache = {}
+
+        # Proces pro psutil a poslední naměřené využití paměti (čas, hodnota)
+        self._process = None
+        self._memory_info = (0.0, None)
+
         # Inicializace logovacího souboru
         self._init_system_log()
 
@@ -64,7 +98,13 @@ class SystemService(ServiceBase):
     def _init_system_log(self):
         """
         Inicializace logovacího souboru pro systémové události
+
+        Soubor se otevře jen jednou; zápis obstarává samostatné vlákno
+        (QueueListener), takže volající pouze vloží záznam do fronty.
         """
+        self._system_log = None
+        self._log_listener = None
+
         try:
             # Získání adresáře pro logy
             if self.config_service:
@@ -78,30 +118,45 @@ class SystemService(ServiceBase):
             # Cesta k logovacímu souboru
             self.system_log_file = os.path.join(log_dir, "system.log")
 
-            # Kontrola a rotace logu
-            self._rotate_log_file()
+            # Rotaci (10 MB) řeší handler při zápisu
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.system_log_file,
+                maxBytes=_SYSTEM_LOG_MAX_BYTES,
+                backupCount=_SYSTEM_LOG_BACKUPS,
+                encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter(
+                "%(asctime)s [%(log_type)s] %(message)s", "%Y-%m-%d %H:%M:%S"
+            ))
+
+            # Samostatný logger mimo globální hierarchii (bez propagace do root loggeru)
+            log_queue = queue.SimpleQueue()
+            system_log = logging.Logger("system_log")
+            system_log.propagate = False
+            system_log.addHandler(logging.handlers.QueueHandler(log_queue))
+
+            self._log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+            self._log_listener.start()
+            self._system_log = system_log
+            atexit.register(self.close)
         except Exception as e:
             self.logger.error(f"Chyba při inicializaci systémového logu: {e}")
 
-    def _rotate_log_file(self):
+    def close(self):
         """
-        Rotace logovacího souboru, pokud je příliš velký
+        Dopsání zbývajících záznamů a uzavření systémového logu
         """
-        try:
-            # Max velikost logu (10 MB)
-            max_size = 10 * 1024 * 1024
-
-            # Pokud soubor existuje a je větší než max_size
-            if os.path.exists(self.system_log_file) and os.path.getsize(self.system_log_file) > max_size:
-                # Přejmenování souboru s časovou značkou
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = f"{self.system_log_file}.{timestamp}"
-                os.rename(self.system_log_file, backup_file)
-
-                # Záznam o rotaci
-                self.logger.info(f"Systémový log byl rotován: {backup_file}")
-        except Exception as e:
-            self.logger.error(f"Chyba při rotaci logovacího souboru: {e}")
+        listener = self._log_listener
+        if listener is None:
+            return
+
+        self._log_listener = None
+        self._system_log = None
+        # Uzavřená instance už nemá být držena registrací pro ukončení procesu
+        atexit.unregister(self.close)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
     def register_service(self, service_name, service_instance):
         """
@@ -151,8 +206,8 @@ class SystemService(ServiceBase):
 
         # Aktualizace informací v monitoringu
         if "auth" in self.services:
-            self.services["auth"]["last_updated"] = datetime.now()
             self.services["auth"]["auth_status"] = auth_status
+            self.update_service_status("auth", "healthy" if auth_status["authenticated"] else "degraded")
 
             # Zaznamenání události
             if auth_status["authenticated"]:
@@ -162,6 +217,41 @@ class SystemService(ServiceBase):
 
         return auth_status
 
+    def update_service_status(self, service_name, health, details=None):
+        """
+        Oznámení změny stavu služby (volá služba při přechodu stavu)
+
+        Oznámený stav je jen nápověda: služby s vlastní kontrolou (auth,
+        cache, config) se v get_service_health vždy ověří znovu, oznámení
+        pouze zahodí jejich uložený výsledek. Uložený stav se použije pro
+        služby bez vlastní kontroly.
+
+        Args:
+            service_name (str): Název služby
+            health (str): Stav zdraví ('healthy', 'degraded', 'unhealthy')
+            details (dict, optional): Dodatečné informace o stavu
+
+        Returns:
+            bool: True pokud byl stav uložen
+        """
+        service_info = self.services.get(service_name)
+        if service_info is None:
+            service_info = self.services[service_name] = {
+                "instance": None,
+                "registered_at": datetime.now(),
+                "status": "active"
+            }
+
+        service_info["health"] = health
+        service_info["last_updated"] = datetime.now()
+        if details is not None:
+            service_info["details"] = details
+
+        # Příští dotaz na stav služby se vyhodnotí znovu
+        self._status_cache.pop(service_name, None)
+
+        return True
+
     def log_error(self, service_name, error_message, error_details=None):
         """
         Zaznamenání chyby do systémového logu
@@ -174,32 +264,27 @@ class SystemService(ServiceBase):
         Returns:
             bool: True pokud byla chyba zaznamenána
         """
+        now = datetime.now()
+
         with self._history_lock:
             # Vytvoření záznamu o chybě
             error_entry = {
-                "timestamp": datetime.now(),
+                "timestamp": now,
                 "service": service_name,
                 "message": error_message,
                 "details": error_details
             }
 
-            # Přidání do historie chyb
+            # Přidání do historie chyb (nejstarší záznamy deque zahodí sama)
             self.errors.append(error_entry)
+            self._errors_snapshot = None
 
-            # Omezení délky historie
-            if len(self.errors) > self.max_errors:
-                self.errors = self.errors[-self.max_errors:]
-
-            # Zápis do logovacího souboru
-            self._write_to_system_log(
-                "ERROR",
-                f"[{service_name}] {error_message}" +
-                (f" - {error_details}" if error_details else "")
-            )
+        # Zápis do logovacího souboru (mimo zámek historie)
+        message = f"[{service_name}] {error_message}" + (f" - {error_details}" if error_details else "")
+        self._write_to_system_log("ERROR", message, now)
 
         # Logování přes standardní logger
-        self.logger.error(f"[{service_name}] {error_message}" +
-                          (f" - {error_details}" if error_details else ""))
+        self.logger.error(message)
 
         return True
 
@@ -216,50 +301,55 @@ class SystemService(ServiceBase):
         Returns:
             bool: True pokud byla událost zaznamenána
         """
+        now = datetime.now()
+
         with self._history_lock:
             # Vytvoření záznamu o události
             event_entry = {
-                "timestamp": datetime.now(),
+                "timestamp": now,
                 "service": service_name,
                 "type": event_type,
                 "message": event_message,
                 "data": event_data
             }
 
-            # Přidání do historie událostí
+            # Přidání do historie událostí (nejstarší záznamy deque zahodí sama)
             self.events.append(event_entry)
+            self._events_snapshot = None
 
-            # Omezení délky historie
-            if len(self.events) > self.max_events:
-                self.events = self.events[-self.max_events:]
-
-            # Zápis do logovacího souboru
-            self._write_to_system_log(
-                "EVENT",
-                f"[{service_name}] {event_type}: {event_message}"
-            )
+        # Zápis do logovacího souboru (mimo zámek historie)
+        message = f"[{service_name}] {event_type}: {event_message}"
+        self._write_to_system_log("EVENT", message, now)
 
         # Logování přes standardní logger
-        self.logger.info(f"[{service_name}] {event_type}: {event_message}")
+        self.logger.info(message)
 
         return True
 
-    def _write_to_system_log(self, log_type, message):
+    def _write_to_system_log(self, log_type, message, timestamp=None):
         """
         Zápis zprávy do systémového logovacího souboru
 
         Args:
             log_type (str): Typ záznamu ('ERROR', 'EVENT', 'INFO', atd.)
             message (str): Text zprávy
+            timestamp (datetime, optional): Čas záznamu (výchozí je aktuální čas)
         """
+        system_log = self._system_log
+        if system_log is None:
+            return
+
         try:
-            # Formátování záznamu
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_entry = f"{timestamp} [{log_type}] {message}\n"
+            record = system_log.makeRecord(
+                system_log.name, logging.INFO, __file__, 0, message, None, None,
+                extra={"log_type": log_type}
+            )
+            # Stejný čas jako v historii, bez dalšího čtení hodin
+            if timestamp is not None:
+                record.created = timestamp.timestamp()
 
-            # Zápis do souboru
-            with open(self.system_log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
+            # Zápis provede vlákno QueueListeneru
+            system_log.handle(record)
 
         except Exception as e:
             # Pokud se nepodaří zapsat do souboru, použijeme standardní logger
@@ -278,10 +368,10 @@ class SystemService(ServiceBase):
             "version": self._get_config("APP_VERSION", "4.0.25-hf.0"),
             "language": self._get_config("LANGUAGE", "cz"),
             "uptime": self._get_uptime(),
-            "system_info": self._get_system_info(),
+            "system_info": self._probe("system_info", self._get_system_info),
             "services": self._get_services_status(),
-            "cache": self._get_cache_info(),
-            "auth": self._get_auth_status(),
+            "cache": self._probe("cache", self._get_cache_info),
+            "auth": self._probe("auth", self._get_auth_status),
             "error_count": len(self.errors),
             "event_count": len(self.events)
         }
@@ -291,6 +381,30 @@ class SystemService(ServiceBase):
 
         return status
 
+    def _probe(self, name, compute):
+        """
+        Získání výsledku stavového dotazu s krátkodobou cache
+
+        Dashboard nebo health check dotazující se každou sekundu tak
+        nezatěžuje AuthService a CacheService opakovanými dotazy.
+
+        Args:
+            name (str): Název dotazu
+            compute (callable): Funkce pro získání aktuální hodnoty
+
+        Returns:
+            any: Výsledek dotazu (slovník se vrací jako kopie)
+        """
+        now = time.monotonic()
+        hit = self._status_cache.get(name)
+        if hit is not None and now - hit[0] < _STATUS_CACHE_TTL:
+            value = hit[1]
+        else:
+            value = compute()
+            self._status_cache[name] = (now, value)
+
+        return dict(value) if isinstance(value, dict) else value
+
     def _get_services_status(self):
         """
         Získání stavu registrovaných služeb
@@ -339,26 +453,29 @@ class SystemService(ServiceBase):
         Returns:
             dict: Stav autentizace
         """
-        if not self.auth_service:
+        auth = self.auth_service
+        if not auth:
             return {"status": "not_initialized"}
 
         # Pokud je k dispozici nová metoda get_auth_status
-        if hasattr(self.auth_service, "get_auth_status") and callable(getattr(self.auth_service, "get_auth_status")):
-            return self.auth_service.get_auth_status()
+        get_auth_status = getattr(auth, "get_auth_status", None)
+        if callable(get_auth_status):
+            return get_auth_status()
 
         # Kompatibilita se starší verzí
-        token_valid = bool(self.auth_service.refresh_token)
-        token_expires = 0
-
-        if token_valid and self.auth_service.token_expires > 0:
-            token_expires = int(self.auth_service.token_expires - time.time())
-            token_valid = token_expires > 0
+        token_expires = auth.token_expires
+        if auth.refresh_token and token_expires > 0:
+            remaining = int(token_expires - time.time())
+            token_valid = remaining > 0
+        else:
+            remaining = 0
+            token_valid = bool(auth.refresh_token)
 
         return {
             "status": "authenticated" if token_valid else "not_authenticated",
             "token_valid": token_valid,
-            "token_expires": token_expires,
-            "language": self.auth_service.language
+            "token_expires": remaining,
+            "language": auth.language
         }
 
     def _get_cache_info(self):
@@ -390,14 +507,12 @@ class SystemService(ServiceBase):
         Returns:
             dict: Informace o systému
         """
+        now = datetime.now()
         return {
-            "platform": platform.platform(),
-            "python_version": platform.python_version(),
-            "hostname": platform.node(),
-            "cpu_count": os.cpu_count() or 0,
+            **self._static_system_info,
             "pid": os.getpid(),
             "memory_info": self._get_memory_info(),
-            "timezone": datetime.now().astimezone().tzinfo.tzname(datetime.now())
+            "timezone": now.astimezone().tzinfo.tzname(now)
         }
 
     def _get_memory_info(self):
@@ -407,12 +522,21 @@ class SystemService(ServiceBase):
         Returns:
             dict: Informace o paměti
         """
+        now = time.monotonic()
+        cached_at, cached = self._memory_info
+        if cached is not None and now - cached_at < _MEMORY_INFO_TTL:
+            return dict(cached)
+
         try:
             import psutil
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
+            if self._process is None:
+                self._process = psutil.Process(os.getpid())
+
+            # Načtení všech údajů o procesu najednou
+            with self._process.oneshot():
+                memory_info = self._process.memory_info()
 
-            return {
+            result = {
                 "rss": memory_info.rss,  # Resident Set Size
                 "rss_mb": round(memory_info.rss / (1024 * 1024), 2),  # MB
                 "vms": memory_info.vms,  # Virtual Memory Size
@@ -420,7 +544,10 @@ class SystemService(ServiceBase):
             }
         except (ImportError, Exception):
             # Pokud není k dispozici psutil nebo nastane jiná chyba
-            return {"available": False}
+            result = {"available": False}
+
+        self._memory_info = (now, result)
+        return dict(result)
 
     def clear_all_caches(self):
         """
@@ -429,6 +556,8 @@ class SystemService(ServiceBase):
         Returns:
             bool: True v případě úspěchu
         """
+        self._status_cache.pop("cache", None)
+
         if self.cache_service:
             return self.cache_service.clear_cache()
 
@@ -459,6 +588,7 @@ class SystemService(ServiceBase):
 
         # Přihlásíme se znovu
         success = self.auth_service.login()
+        self._status_cache.pop("auth", None)
 
         # Zaznamenání výsledku
         if success:
@@ -468,44 +598,69 @@ class SystemService(ServiceBase):
 
         return success
 
+    def _get_errors_snapshot(self):
+        """
+        Získání neměnné kopie historie chyb
+
+        Kopie se vytváří pod zámkem jen po změně historie; jinak se čte bez zámku.
+
+        Returns:
+            tuple: Záznamy o chybách od nejstaršího
+        """
+        snapshot = self._errors_snapshot
+        if snapshot is None:
+            with self._history_lock:
+                snapshot = self._errors_snapshot = tuple(self.errors)
+        return snapshot
+
+    def _get_events_snapshot(self):
+        """
+        Získání neměnné kopie historie událostí
+
+        Returns:
+            tuple: Záznamy o událostech od nejstaršího
+        """
+        snapshot = self._events_snapshot
+        if snapshot is None:
+            with self._history_lock:
+                snapshot = self._events_snapshot = tuple(self.events)
+        return snapshot
+
     def get_errors(self, limit=10, service=None, since=None):
         """
         Získání posledních chyb ze systémového logu
 
         Args:
-            limit (int): Maximální počet chyb k vrácení
+            limit (int): Maximální počet chyb k vrácení (0 nebo méně = bez omezení)
             service (str, optional): Filtrování podle služby
             since (datetime, optional): Filtrování od daného data a času
 
         Returns:
             list: Seznam chyb
         """
-        with self._history_lock:
-            filtered_errors = self.errors.copy()
-
-            # Filtrování podle služby
-            if service:
-                filtered_errors = [e for e in filtered_errors if e["service"] == service]
+        # Jeden průchod od nejnovějších záznamů, ukončený po dosažení limitu
+        matches = (
+            e for e in reversed(self._get_errors_snapshot())
+            if (not service or e["service"] == service)
+            and (not since or e["timestamp"] >= since)
+        )
+        latest = list(itertools.islice(matches, limit if limit > 0 else None))
 
-            # Filtrování podle času
-            if since:
-                filtered_errors = [e for e in filtered_errors if e["timestamp"] >= since]
+        # Obnovení chronologického pořadí a konverze času na string
+        result = []
+        for error in reversed(latest):
+            error_copy = error.copy()
+            error_copy["timestamp"] = error_copy["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
+            result.append(error_copy)
 
-            # Omezení počtu a konverze času na string
-            result = []
-            for error in filtered_errors[-limit:]:
-                error_copy = error.copy()
-                error_copy["timestamp"] = error_copy["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-                result.append(error_copy)
-
-            return result
+        return result
 
     def get_events(self, limit=20, service=None, event_type=None, since=None):
         """
         Získání posledních událostí ze systémového logu
 
         Args:
-            limit (int): Maximální počet událostí k vrácení
+            limit (int): Maximální počet událostí k vrácení (0 nebo méně = bez omezení)
             service (str, optional): Filtrování podle služby
             event_type (str, optional): Filtrování podle typu události
             since (datetime, optional): Filtrování od daného data a času
@@ -513,29 +668,23 @@ class SystemService(ServiceBase):
         Returns:
             list: Seznam událostí
         """
-        with self._history_lock:
-            filtered_events = self.events.copy()
+        # Jeden průchod od nejnovějších záznamů, ukončený po dosažení limitu
+        matches = (
+            e for e in reversed(self._get_events_snapshot())
+            if (not service or e["service"] == service)
+            and (not event_type or e["type"] == event_type)
+            and (not since or e["timestamp"] >= since)
+        )
+        latest = list(itertools.islice(matches, limit if limit > 0 else None))
 
-            # Filtrování podle služby
-            if service:
-                filtered_events = [e for e in filtered_events if e["service"] == service]
+        # Obnovení chronologického pořadí a konverze času na string
+        result = []
+        for event in reversed(latest):
+            event_copy = event.copy()
+            event_copy["timestamp"] = event_copy["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
+            result.append(event_copy)
 
-            # Filtrování podle typu
-            if event_type:
-                filtered_events = [e for e in filtered_events if e["type"] == event_type]
-
-            # Filtrování podle času
-            if since:
-                filtered_events = [e for e in filtered_events if e["timestamp"] >= since]
-
-            # Omezení počtu a konverze času na string
-            result = []
-            for event in filtered_events[-limit:]:
-                event_copy = event.copy()
-                event_copy["timestamp"] = event_copy["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-                result.append(event_copy)
-
-            return result
+        return result
 
     def export_system_logs(self, days=7):
         """
@@ -549,18 +698,19 @@ class SystemService(ServiceBase):
         """
         try:
             # Časové omezení
-            since = datetime.now() - timedelta(days=days)
+            now = datetime.now()
+            since = now - timedelta(days=days)
 
             # Export chyb a událostí
             export_data = {
-                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "generated_at": now.strftime("%Y-%m-%d %H:%M:%S"),
                 "period_days": days,
-                "system_info": self._get_system_info(),
+                "system_info": self._probe("system_info", self._get_system_info),
                 "errors": self.get_errors(limit=1000, since=since),
                 "events": self.get_events(limit=1000, since=since),
                 "services": self._get_services_status(),
-                "auth_status": self._get_auth_status(),
-                "cache_status": self._get_cache_info()
+                "auth_status": self._probe("auth", self._get_auth_status),
+                "cache_status": self._probe("cache", self._get_cache_info)
             }
 
             return export_data
@@ -582,13 +732,13 @@ class SystemService(ServiceBase):
         }
 
         # Kontrola všech registrovaných služeb
-        for name, service_info in self.services.items():
+        for name, service_info in list(self.services.items()):
             service_status = service_info.get("status", "unknown")
 
             # Specifická kontrola pro AuthService
             if name == "auth" and self.auth_service:
                 try:
-                    auth_status = self.auth_service.get_auth_status()
+                    auth_status = self._probe("auth", self._get_auth_status)
                     is_healthy = auth_status.get("authenticated", False)
                     health["services"]["auth"] = "healthy" if is_healthy else "degraded"
                 except Exception:
@@ -596,7 +746,7 @@ class SystemService(ServiceBase):
             # Kontrola CacheService
             elif name == "cache" and self.cache_service:
                 try:
-                    cache_info = self.cache_service.get_cache_info()
+                    cache_info = self._probe("cache", self._get_cache_info)
                     is_healthy = cache_info and not cache_info.get("error", False)
                     health["services"]["cache"] = "healthy" if is_healthy else "degraded"
                 except Exception:
@@ -609,6 +759,9 @@ class SystemService(ServiceBase):
                     health["services"]["config"] = "healthy" if is_healthy else "degraded"
                 except Exception:
                     health["services"]["config"] = "unhealthy"
+            # Stav oznámený samotnou službou (update_service_status)
+            elif "health" in service_info:
+                health["services"][name] = service_info["health"]
             # Obecná kontrola
             else:
                 health["services"][name] = service_status if service_status in ["healthy", "degraded",
@@ -6,13 +6,27 @@ HTTP klient pro komunikaci s MagentaTV/MagioTV API
 Tento modul poskytuje rozšířenou funkcionalitu pro HTTP požadavky
 určené specificky pro komunikaci s MagentaTV/MagioTV API.
 """
+import copy
 import requests
 import logging
-from urllib.parse import urlparse
+import threading
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from Services.utils.constants import DEFAULT_USER_AGENT, TIME_CONSTANTS
 
+try:
+    import orjson as _json
+except ImportError:
+    # orjson je volitelná závislost, bez ní se použije standardní json
+    import json as _json
+
 logger = logging.getLogger(__name__)
 
+# Velikost poolu keep-alive spojení pro souběžné požadavky na API
+_POOL_CONNECTIONS = 50
+_POOL_MAXSIZE = 100
+
 
 class MagentaHTTPClient:
     """
@@ -36,16 +50,30 @@ class MagentaHTTPClient:
         self.user_agent = user_agent or DEFAULT_USER_AGENT
         self.session = requests.Session()
 
-        # Základní hlavičky pro všechny požadavky
+        # Probíhající GET požadavky pro sloučení souběžných stejných dotazů
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        # Pool spojení s opakováním při přechodných chybách serveru
+        retries = Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Základní hlavičky pro všechny požadavky (Host doplní urllib3 podle cílové URL,
+        # pevná hodnota by se chybně posílala i při přesměrování a v get_redirect_url)
         self.session.headers.update({
             "User-Agent": self.user_agent,
-            "Host": urlparse(self.base_url).netloc
+            "Accept-Encoding": "gzip, deflate"
         })
 
     def get(self, endpoint, params=None, headers=None, timeout=None):
         """
         Odeslání GET požadavku
 
+        Souběžné požadavky se stejným endpointem, parametry a hlavičkami se
+        sloučí do jednoho; ostatní volající dostanou vlastní kopii odpovědi.
+
         Args:
             endpoint (str): Cílový endpoint (bez základní URL)
             params (dict, optional): Parametry pro požadavek
@@ -55,7 +83,52 @@ class MagentaHTTPClient:
         Returns:
             dict: JSON odpověď nebo None v případě chyby
         """
-        url = f"{self.base_url}{endpoint}"
+        key = (
+            endpoint,
+            tuple(sorted(params.items())) if params else None,
+            tuple(sorted(headers.items())) if headers else None
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Nehashovatelné parametry (např. seznamy) - bez slučování
+            return self._get(endpoint, params, headers, timeout)
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            # Kopie - úprava výsledku jedním volajícím se nesmí projevit u ostatních
+            return copy.deepcopy(future.result())
+
+        try:
+            result = self._get(endpoint, params, headers, timeout)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _get(self, endpoint, params=None, headers=None, timeout=None):
+        """
+        Odeslání GET požadavku bez slučování
+
+        Args:
+            endpoint (str): Cílový endpoint (bez základní URL)
+            params (dict, optional): Parametry pro požadavek
+            headers (dict, optional): Dodatečné hlavičky
+            timeout (int, optional): Timeout v sekundách nebo None pro výchozí
+
+        Returns:
+            dict: JSON odpověď nebo None v případě chyby
+        """
+        url = self.base_url + endpoint
         timeout = timeout or TIME_CONSTANTS["DEFAULT_TIMEOUT"]
 
         try:
@@ -74,9 +147,9 @@ class MagentaHTTPClient:
                 return None
 
             # Parsování JSON odpovědi
-            return response.json()
+            return _json.loads(response.content)
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Chyba při GET požadavku na {url}: {e}")
             return None
 
@@ -95,7 +168,7 @@ class MagentaHTTPClient:
         Returns:
             dict: JSON odpověď nebo None v případě chyby
         """
-        url = f"{self.base_url}{endpoint}"
+        url = self.base_url + endpoint
         timeout = timeout or TIME_CONSTANTS["DEFAULT_TIMEOUT"]
 
         # Nastavení hlavičky Content-Type pro JSON data
@@ -122,9 +195,9 @@ class MagentaHTTPClient:
                 return None
 
             # Parsování JSON odpovědi
-            return response.json()
+            return _json.loads(response.content)
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Chyba při POST požadavku na {url}: {e}")
             return None
 
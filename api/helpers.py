@@ -4,17 +4,24 @@
 Helper functions for API endpoints
 """
 
-import functools
 import logging
+import threading
 from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, the default Flask JSON provider is used without it
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 # Global API instance
 _api_instance = None
+_api_lock = threading.Lock()
 
 
-@functools.lru_cache(maxsize=1)
 def get_api():
     """
     Get or create API instance
@@ -24,7 +31,16 @@ def get_api():
     """
     global _api_instance
 
-    if _api_instance is None:
+    # Fast path without locking once the instance exists
+    instance = _api_instance
+    if instance is not None:
+        return instance
+
+    # Only one thread creates the instance and logs in
+    with _api_lock:
+        if _api_instance is not None:
+            return _api_instance
+
         # Import here to avoid circular import
         from Services.factory.service_factory import get_magenta_tv_service
 
@@ -34,20 +50,21 @@ def get_api():
             return None
 
         # Create new instance
-        _api_instance = get_magenta_tv_service()
+        instance = get_magenta_tv_service()
 
         # Check if service was created
-        if _api_instance is None:
+        if instance is None:
             logger.error("Failed to create MagentaTV service!")
             return None
 
         # Login
-        if not _api_instance.login():
+        if not instance.login():
             logger.error("Failed to login to API!")
-            _api_instance = None
             return None
 
-    return _api_instance
+        # Publish only a logged-in instance
+        _api_instance = instance
+        return instance
 
 
 def server_url_from_request():
@@ -75,6 +92,58 @@ def clear_api():
     Clear API instance cache
     """
     global _api_instance
-    _api_instance = None
-    get_api.cache_clear()
-    logger.info("API instance cache cleared")
\ No newline at end of file
+
+    # Import here to avoid circular import
+    from Services.factory.service_factory import clear_magenta_tv_service
+
+    with _api_lock:
+        _api_instance = None
+        clear_magenta_tv_service()
+    logger.info("API instance cache cleared")
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson
+
+    Output matches the default provider (sorted keys, HTTP dates for
+    datetimes). Pretty-printed debug responses and values orjson cannot
+    encode fall back to the default provider.
+    """
+
+    _options = 0
+    if orjson is not None:
+        _options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _encode(self, obj):
+        """
+        Encode an object to JSON bytes with orjson
+
+        Returns:
+            bytes: JSON, or None if orjson is unavailable or cannot encode the object
+        """
+        if orjson is None:
+            return None
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options)
+        except orjson.JSONEncodeError:
+            return None
+
+    def dumps(self, obj, **kwargs):
+        if not kwargs:
+            data = self._encode(obj)
+            if data is not None:
+                return data.decode()
+
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+
+        data = self._encode(self._prepare_response_obj(args, kwargs))
+        if data is None:
+            return super().response(*args, **kwargs)
+
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
@@ -9,11 +9,56 @@ import logging
 from flask import jsonify, request
 
 from api.helpers import get_api
-from cache import get_from_cache
+from cache import get_from_cache, get_from_cache_bulk, get_cache_index
 
 logger = logging.getLogger(__name__)
 
 
+def _channel_key(channel_id):
+    """
+    Klíč cache pro detail kanálu
+
+    Args:
+        channel_id (str): ID kanálu
+
+    Returns:
+        str: Klíč cache
+    """
+    return f"channel_{channel_id}"
+
+
+def _get_channels(client):
+    """
+    Získání seznamu kanálů s použitím cache
+
+    Při načtení seznamu se do cache uloží i jednotlivé kanály,
+    takže detail kanálu už nevyžaduje další dotaz.
+
+    Args:
+        client (ClientService): Klient API
+
+    Returns:
+        list: Seznam kanálů nebo None
+    """
+    return get_from_cache_bulk("channels", client.get_channels, "id", _channel_key)
+
+
+def _index_channels_by_group(channels):
+    """
+    Sestavení indexu kanálů podle skupiny
+
+    Args:
+        channels (list): Seznam kanálů
+
+    Returns:
+        dict: Název skupiny malými písmeny -> seznam kanálů
+    """
+    index = {}
+    for channel in channels:
+        index.setdefault(channel.get("group", "").lower(), []).append(channel)
+    return index
+
+
 def register_routes(api_blueprint):
     """
     Registrace routes pro kanály
@@ -36,7 +81,7 @@ def register_routes(api_blueprint):
             return jsonify({"success": False, "message": "API is not initialized"}), 500
 
         # Získání kanálů s použitím cache
-        channels_data = get_from_cache("channels", client.get_channels)
+        channels_data = _get_channels(client)
 
         if not channels_data:
             return jsonify({"success": False, "message": "Failed to get channels list"}), 500
@@ -62,9 +107,8 @@ def register_routes(api_blueprint):
         if client is None:
             return jsonify({"success": False, "message": "API is not initialized"}), 500
 
-        # Získání kanálu s použitím cache
-        channel_key = f"channel_{channel_id}"
-        channel_data = get_from_cache(channel_key, client.get_channel, channel_id)
+        # Získání kanálu s použitím cache (po načtení seznamu kanálů už je v cache)
+        channel_data = get_from_cache(_channel_key(channel_id), client.get_channel, channel_id)
 
         if not channel_data:
             return jsonify({"success": False, "message": f"Channel with ID {channel_id} not found"}), 404
@@ -115,16 +159,14 @@ def register_routes(api_blueprint):
             return jsonify({"success": False, "message": "API is not initialized"}), 500
 
         # Získání všech kanálů
-        all_channels = get_from_cache("channels", client.get_channels)
+        all_channels = _get_channels(client)
 
         if not all_channels:
             return jsonify({"success": False, "message": "Failed to get channels list"}), 500
 
-        # Filtrování kanálů podle skupiny
-        filtered_channels = [
-            channel for channel in all_channels
-            if channel.get("group", "").lower() == group_name.lower()
-        ]
+        # Kanály skupiny z indexu sestaveného jednou pro každý seznam kanálů
+        groups_index = get_cache_index("channels", all_channels, _index_channels_by_group)
+        filtered_channels = groups_index.get(group_name.lower(), [])
 
         return jsonify({
             "success": True,
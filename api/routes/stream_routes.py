@@ -5,8 +5,13 @@ API endpointy pro streamy
 
 Tyto endpointy poskytují přístup ke streamům živého vysílání a proxy pro streamy.
 """
+import atexit
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from flask import jsonify, request, redirect, Response
 
 from api.helpers import get_api, server_url_from_request
@@ -14,6 +19,226 @@ from cache import get_from_cache
 
 logger = logging.getLogger(__name__)
 
+# Velikost bloku při přeposílání streamu
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# Timeout pro navázání spojení a čtení z upstreamu (sekundy)
+UPSTREAM_TIMEOUT = (5, 30)
+
+# Hlavičky, které se mezi klientem a upstreamem nepřeposílají (hop-by-hop dle RFC 7230)
+_HOP_BY_HOP = frozenset((
+    "connection", "transfer-encoding", "keep-alive", "proxy-authorization",
+    "proxy-authenticate", "te", "trailers", "upgrade",
+))
+
+# Hlavičky požadavku klienta, které se do upstreamu nepřeposílají
+_REQUEST_SKIP_HEADERS = _HOP_BY_HOP | {"host", "content-length"}
+
+# Sdílená session pro proxy a manifesty - keep-alive spojení se znovu používají
+_upstream = requests.Session()
+_upstream_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128, max_retries=0)
+_upstream.mount("https://", _upstream_adapter)
+_upstream.mount("http://", _upstream_adapter)
+
+
+# Počet segmentů, které se po načtení manifestu stáhnou předem
+PREFETCH_SEGMENTS = 3
+
+# Maximální počet předem stažených segmentů v paměti
+_SEGMENT_CACHE_SIZE = 32
+
+# Maximální celková velikost předem stažených segmentů v paměti (bajty)
+_SEGMENT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Délka segmentu (s), pokud ji manifest neuvádí
+_DEFAULT_SEGMENT_DURATION = 6.0
+
+_prefetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hls-prefetch")
+atexit.register(_prefetch_executor.shutdown, wait=False, cancel_futures=True)
+
+# Hlavičky odpovědi, které po načtení celého (dekomprimovaného) těla neplatí
+_PREFETCH_SKIP_HEADERS = _HOP_BY_HOP | {"content-length", "content-encoding"}
+
+# Hlavičky požadavku, podle kterých upstream rozhoduje o přístupu k segmentu
+_SEGMENT_AUTH_HEADERS = frozenset(("authorization", "cookie"))
+
+# Předem stažené segmenty: (URL, otisk autorizace) -> (platnost do, obsah, hlavičky odpovědi)
+_segment_cache = {}
+_segment_cache_bytes = 0
+_segment_pending = set()
+_segment_lock = threading.Lock()
+
+
+def _segment_key(url, headers):
+    """
+    Klíč předem staženého segmentu
+
+    Segment se smí vrátit jen klientovi se stejnými přihlašovacími
+    hlavičkami, s jakými byl stažen.
+
+    Args:
+        url (str): URL segmentu
+        headers (dict): Hlavičky pro upstream
+
+    Returns:
+        tuple: (URL, otisk autorizačních hlaviček)
+    """
+    auth = sorted(
+        (key.lower(), value) for key, value in headers.items()
+        if key.lower() in _SEGMENT_AUTH_HEADERS
+    )
+    return url, hash(tuple(auth))
+
+
+def _evict_segments(needed, now):
+    """
+    Uvolnění místa v cache segmentů, volá se se zámkem _segment_lock
+
+    Args:
+        needed (int): Velikost ukládaného segmentu v bajtech
+        now (float): Aktuální čas (time.monotonic)
+    """
+    global _segment_cache_bytes
+
+    # Nejprve prošlé segmenty, pak nejstarší
+    for key in [key for key, entry in _segment_cache.items() if entry[0] <= now]:
+        _segment_cache_bytes -= len(_segment_cache.pop(key)[1])
+    while _segment_cache and (
+            len(_segment_cache) >= _SEGMENT_CACHE_SIZE
+            or _segment_cache_bytes + needed > _SEGMENT_CACHE_BYTES):
+        _segment_cache_bytes -= len(_segment_cache.pop(next(iter(_segment_cache)))[1])
+
+
+def _get_prefetched_segment(url, headers):
+    """
+    Získání předem staženého segmentu
+
+    Args:
+        url (str): URL segmentu
+        headers (dict): Hlavičky pro upstream
+
+    Returns:
+        tuple: (platnost do, obsah, hlavičky odpovědi) nebo None, pokud segment není k dispozici
+    """
+    with _segment_lock:
+        entry = _segment_cache.get(_segment_key(url, headers))
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry
+
+
+def _prefetch_segment(url, headers, ttl):
+    """
+    Stažení segmentu do paměti na pozadí
+
+    Args:
+        url (str): URL segmentu
+        headers (dict): Hlavičky pro upstream
+        ttl (float): Doba platnosti v sekundách
+    """
+    global _segment_cache_bytes
+
+    key = _segment_key(url, headers)
+    try:
+        response = _upstream.get(url, headers=headers, timeout=UPSTREAM_TIMEOUT)
+        if response.status_code != 200:
+            return
+
+        content = response.content
+        if len(content) > _SEGMENT_CACHE_BYTES:
+            return
+
+        response_headers = _forward_headers(response.headers, _PREFETCH_SKIP_HEADERS)
+        response_headers.setdefault("Content-Type", "video/mp2t")
+        now = time.monotonic()
+        with _segment_lock:
+            previous = _segment_cache.pop(key, None)
+            if previous is not None:
+                _segment_cache_bytes -= len(previous[1])
+            _evict_segments(len(content), now)
+            _segment_cache[key] = (now + ttl, content, response_headers)
+            _segment_cache_bytes += len(content)
+    except Exception as e:
+        logger.debug(f"Segment prefetch failed for {url}: {e}")
+    finally:
+        with _segment_lock:
+            _segment_pending.discard(key)
+
+
+def _schedule_prefetch(segments, headers, is_live):
+    """
+    Naplánování stažení segmentů, které si přehrávač vyžádá jako první
+
+    Živý přehrávač začíná u konce playlistu, záznam od začátku.
+
+    Args:
+        segments (list): Seznam (URL segmentu, délka v sekundách)
+        headers (dict): Hlavičky pro upstream
+        is_live (bool): True pro živý playlist (bez #EXT-X-ENDLIST)
+    """
+    selected = segments[-PREFETCH_SEGMENTS:] if is_live else segments[:PREFETCH_SEGMENTS]
+    for url, duration in selected:
+        key = _segment_key(url, headers)
+        with _segment_lock:
+            if key in _segment_pending or key in _segment_cache:
+                continue
+            _segment_pending.add(key)
+        _prefetch_executor.submit(_prefetch_segment, url, headers, duration * 2)
+
+
+def _iter_upstream(response):
+    """
+    Přeposílání těla odpovědi z upstreamu po blocích
+
+    Čte se přímo ze socketu (urllib3) bez dekomprese, takže tělo odpovídá
+    přeposlaným hlavičkám Content-Encoding a Content-Length. Spojení se po
+    přenosu (i přerušeném klientem) vrátí do poolu.
+
+    Args:
+        response (requests.Response): Streamovaná odpověď z upstreamu
+
+    Yields:
+        bytes: Blok dat
+    """
+    try:
+        yield from response.raw.stream(PROXY_CHUNK_SIZE, decode_content=False)
+    finally:
+        response.close()
+
+
+def _forward_headers(headers, skip=_HOP_BY_HOP):
+    """
+    Filtrování hlaviček přeposílaných mezi klientem a upstreamem
+
+    Args:
+        headers: Hlavičky požadavku nebo odpovědi
+        skip (frozenset): Názvy vynechaných hlaviček (malými písmeny)
+
+    Returns:
+        dict: Hlavičky bez vynechaných hlaviček
+    """
+    return {key: value for key, value in headers.items() if key.lower() not in skip}
+
+
+def _upstream_url(url):
+    """
+    Sestavení URL pro upstream z cesty proxy a query stringu aktuálního požadavku
+
+    Flask query string do parametru <path:url> nezahrnuje, URL segmentů
+    a manifestů (např. s tokenem CDN) by se tak bez něj zkrátily.
+
+    Args:
+        url (str): URL z cesty požadavku
+
+    Returns:
+        str: Úplná URL
+    """
+    if not url.startswith('http'):
+        url = 'https://' + url
+    if request.query_string:
+        url = f"{url}?{request.query_string.decode()}"
+    return url
+
 
 def register_routes(api_blueprint):
     """
@@ -69,24 +294,26 @@ def register_routes(api_blueprint):
         Returns:
             Response: Odpověď ze streamu
         """
-        if not url.startswith('http'):
-            url = 'https://' + url
+        url = _upstream_url(url)
 
         # Získání parametrů z požadavku
-        headers = {}
-        for key, value in request.headers.items():
-            if key.lower() not in ['host', 'content-length', 'connection']:
-                headers[key] = value
+        headers = _forward_headers(request.headers, _REQUEST_SKIP_HEADERS)
+
+        # Segment stažený předem při načtení manifestu (celý, proto ne pro požadavky s Range)
+        if 'Range' not in request.headers:
+            prefetched = _get_prefetched_segment(url, headers)
+            if prefetched is not None:
+                return Response(prefetched[1], status=200, headers=prefetched[2])
 
         # Vytvoření požadavku
         try:
-            response = requests.get(url, headers=headers, stream=True)
+            response = _upstream.get(url, headers=headers, stream=True, timeout=UPSTREAM_TIMEOUT)
 
             # Vytvoření odpovědi
             flask_response = Response(
-                response=response.iter_content(chunk_size=1024),
+                response=_iter_upstream(response),
                 status=response.status_code,
-                headers=dict(response.headers)
+                headers=_forward_headers(response.headers)
             )
 
             return flask_response
@@ -106,49 +333,68 @@ def register_routes(api_blueprint):
         Returns:
             Response: Upravený manifest
         """
-        if not url.startswith('http'):
-            url = 'https://' + url
+        url = _upstream_url(url)
 
         # Získání parametrů z požadavku
-        headers = {}
-        for key, value in request.headers.items():
-            if key.lower() not in ['host', 'content-length', 'connection']:
-                headers[key] = value
+        headers = _forward_headers(request.headers, _REQUEST_SKIP_HEADERS)
 
         # Base URL pro relativní cesty
-        base_url = "/".join(url.split('/')[:-1])
+        base_url = "/".join(url.split('?', 1)[0].split('/')[:-1])
         server_url = server_url_from_request()
 
         try:
             # Získání manifestu
-            response = requests.get(url, headers=headers)
-            manifest = response.text
+            response = _upstream.get(url, headers=headers, timeout=UPSTREAM_TIMEOUT)
+            manifest = response.content
 
             # Ověření, že se jedná o HLS manifest
-            if not manifest.startswith('#EXTM3U'):
+            if not manifest.startswith(b'#EXTM3U'):
                 return Response(manifest, mimetype=response.headers.get('Content-Type', 'text/plain'))
 
-            # Úprava URL v manifestu (nahrazení relativních cest za absolutní)
-            lines = manifest.splitlines()
+            # Úprava URL v manifestu (nahrazení relativních cest za absolutní) - přímo nad bajty
+            proxy_prefix = f"{server_url}/api/proxy/".encode()
+            base = base_url.encode()
             modified_lines = []
+            append = modified_lines.append
 
-            for line in lines:
-                if line.startswith('#'):
+            # Mediální segmenty (URL za #EXTINF) a jejich délky pro prefetch
+            segments = []
+            segment_duration = None
+
+            for line in manifest.splitlines():
+                if line[:1] == b'#':
                     # Komentáře a tagy necháme beze změny
-                    modified_lines.append(line)
+                    append(line)
+                    if line.startswith(b'#EXTINF:'):
+                        try:
+                            segment_duration = float(line[8:].split(b',', 1)[0])
+                        except ValueError:
+                            segment_duration = _DEFAULT_SEGMENT_DURATION
                 elif line.strip():
-                    # URL řádky - zkontrolujeme, zda jsou absolutní nebo relativní
-                    if line.startswith('http'):
-                        # Absolutní URL přesměrujeme přes proxy
-                        modified_lines.append(f"{server_url}/api/proxy/{line}")
+                    # URL řádky - absolutní ponecháme, relativní doplníme o base_url
+                    if line.startswith(b'http'):
+                        full_url = line
+                    elif line[:1] == b'/':
+                        full_url = base + line
                     else:
-                        # Relativní URL doplníme o base_url a přesměrujeme přes proxy
-                        full_url = f"{base_url}/{line}" if not line.startswith('/') else f"{base_url}{line}"
-                        modified_lines.append(f"{server_url}/api/proxy/{full_url}")
+                        full_url = base + b'/' + line
+
+                    # URL přesměrujeme přes proxy
+                    append(proxy_prefix + full_url)
+
+                    if segment_duration is not None:
+                        segments.append((full_url.decode(), segment_duration))
+                        segment_duration = None
                 else:
                     # Prázdné řádky zachováme
-                    modified_lines.append(line)
+                    append(line)
+
+            # Stažení prvních segmentů na pozadí, než si je přehrávač vyžádá
+            if segments:
+                _schedule_prefetch(segments, headers, b'#EXT-X-ENDLIST' not in manifest)
 
             # Vrácení upraveného manifestu
-            modified_manifest = '\n'.join(modified_lines)
-            return Response(modified_manifest, mimetype='application/vnd.apple.mpegurl')
\ No newline at end of file
+            return Response(b'\n'.join(modified_lines), mimetype='application/vnd.apple.mpegurl')
+        except Exception as e:
+            logger.error(f"Error processing HLS manifest: {e}")
+            return jsonify({"success": False, "message": f"Error processing HLS manifest: {str(e)}"}), 500
@@ -3,32 +3,103 @@
 """
 Cache implementation for the MagentaTV backend
 """
+import heapq
+import itertools
 import time
 import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global cache variables
+# Global cache: key -> (expiry deadline as a time.monotonic() value, data)
 cache = {}
-cache_expiry = {}
 cache_lock = threading.Lock()
 
+# Upper bound on cached entries; expired entries are evicted first, then the oldest
+CACHE_MAX_ENTRIES = 10_000
+
+# Lookup counters (updated without a lock, so approximate under contention)
+cache_stats = {"hits": 0, "misses": 0}
+
+# Indexes derived from cached data: cache key -> (source data, index)
+cache_indexes = {}
+
+# Fetches currently in progress, keyed by cache key (singleflight)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+_MISSING = object()
+
+# Number of keys listed by get_cache_info
+_CACHE_INFO_SAMPLE = 20
+
+
+class _InFlight:
+    """
+    A fetch in progress that other callers for the same key can wait on
+    """
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _lookup(cache_key):
+    """
+    Lock-free read of a non-expired cache entry
+
+    Args:
+        cache_key (str): Cache key
+
+    Returns:
+        any: Cached data, or _MISSING if absent or expired
+    """
+    entry = cache.get(cache_key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    return _MISSING
+
+
+def _store(items, expires):
+    """
+    Store entries in the cache, evicting entries over CACHE_MAX_ENTRIES
+
+    Must be called with cache_lock held.
+
+    Args:
+        items (iterable): (cache key, data) pairs
+        expires (float): Expiry deadline (time.monotonic() value)
+    """
+    for cache_key, data in items:
+        # Re-inserting moves the key to the end, so dict order stays oldest-first
+        cache.pop(cache_key, None)
+        cache[cache_key] = (expires, data)
+
+    if len(cache) <= CACHE_MAX_ENTRIES:
+        return
+
+    now = time.monotonic()
+    for cache_key in [key for key, entry in cache.items() if entry[0] <= now]:
+        del cache[cache_key]
+        cache_indexes.pop(cache_key, None)
+
+    excess = len(cache) - CACHE_MAX_ENTRIES
+    if excess > 0:
+        for cache_key in list(itertools.islice(cache, excess)):
+            del cache[cache_key]
+            cache_indexes.pop(cache_key, None)
+
 
 def init_cache():
     """
     Initialize the cache
     """
-    global cache, cache_expiry
-
     with cache_lock:
-        cache = {
-            "channels": {},
-            "streams": {},
-            "epg": {},
-            "devices": {}
-        }
-        cache_expiry = {}
+        cache.clear()
+        cache_indexes.clear()
 
     logger.debug("Cache initialized")
 
@@ -45,26 +116,122 @@ def get_from_cache(cache_key, fetch_function, *args, **kwargs):
     Returns:
         any: Data from cache or function
     """
-    with cache_lock:
-        # Check cache
-        if cache_key in cache and time.time() < cache_expiry.get(cache_key, 0):
-            logger.debug(f"Data retrieved from cache: {cache_key}")
-            return cache[cache_key]
+    # Check cache (plain dict reads, no lock needed)
+    data = _lookup(cache_key)
+    if data is not _MISSING:
+        cache_stats["hits"] += 1
+        logger.debug(f"Data retrieved from cache: {cache_key}")
+        return data
+
+    cache_stats["misses"] += 1
+
+    # Only one caller fetches a given key; the others wait for its result
+    with _inflight_lock:
+        call = _inflight.get(cache_key)
+        leader = call is None
+        if leader:
+            call = _inflight[cache_key] = _InFlight()
+
+    if not leader:
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
 
-    # Fetch data
+    try:
+        # Another fetch may have finished between the lookup and taking the lead
+        data = _lookup(cache_key)
+        if data is _MISSING:
+            data = _fetch_and_store(cache_key, fetch_function, *args, **kwargs)
+        call.result = data
+        return data
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+        call.event.set()
+
+
+def _fetch_and_store(cache_key, fetch_function, *args, **kwargs):
+    """
+    Fetch data and store it in the cache
+
+    Args:
+        cache_key (str): Cache key
+        fetch_function (callable): Function to fetch data
+        *args, **kwargs: Arguments to pass to the fetch function
+
+    Returns:
+        any: Fetched data
+    """
     data = fetch_function(*args, **kwargs)
 
     # Store in cache
     if data is not None:
+        from flask import current_app
+        expires = time.monotonic() + current_app.config["CACHE_TIMEOUT"]
         with cache_lock:
-            from flask import current_app
-            cache[cache_key] = data
-            cache_expiry[cache_key] = time.time() + current_app.config["CACHE_TIMEOUT"]
+            _store(((cache_key, data),), expires)
             logger.debug(f"Data stored in cache: {cache_key}")
 
     return data
 
 
+def get_from_cache_bulk(list_key, fetch_function, id_field, per_item_key_fn, *args, **kwargs):
+    """
+    Get a list from cache; when it is fetched, also cache each item under its own key
+
+    Args:
+        list_key (str): Cache key for the whole list
+        fetch_function (callable): Function to fetch the list if not in cache
+        id_field (str): Item field holding the item ID
+        per_item_key_fn (callable): Function mapping an item ID to its cache key
+        *args, **kwargs: Arguments to pass to the fetch function
+
+    Returns:
+        any: List from cache or function
+    """
+    def fetch_and_split(*fetch_args, **fetch_kwargs):
+        items = fetch_function(*fetch_args, **fetch_kwargs)
+
+        if items:
+            from flask import current_app
+            expires = time.monotonic() + current_app.config["CACHE_TIMEOUT"]
+            with cache_lock:
+                _store(((per_item_key_fn(item[id_field]), item) for item in items), expires)
+            logger.debug(f"Cached {len(items)} items from {list_key}")
+
+        return items
+
+    return get_from_cache(list_key, fetch_and_split, *args, **kwargs)
+
+
+def get_cache_index(cache_key, data, build_index):
+    """
+    Get an index derived from cached data, built once per cached value
+
+    The index is rebuilt whenever the cache key holds a different object
+    than the one the index was built from (e.g. after a refresh).
+
+    Args:
+        cache_key (str): Cache key of the source data
+        data (any): Current source data (as returned by get_from_cache)
+        build_index (callable): Function building the index from the data
+
+    Returns:
+        any: The index
+    """
+    entry = cache_indexes.get(cache_key)
+    if entry is not None and entry[0] is data:
+        return entry[1]
+
+    index = build_index(data)
+    cache_indexes[cache_key] = (data, index)
+    return index
+
+
 def clear_cache(cache_key=None):
     """
     Clear cache entries
@@ -78,20 +245,13 @@ def clear_cache(cache_key=None):
     with cache_lock:
         if cache_key is None:
             # Clear all cache
-            global cache, cache_expiry
-            cache = {
-                "channels": {},
-                "streams": {},
-                "epg": {},
-                "devices": {}
-            }
-            cache_expiry = {}
+            cache.clear()
+            cache_indexes.clear()
             logger.debug("All cache entries cleared")
         elif cache_key in cache:
             # Clear specific entry
             del cache[cache_key]
-            if cache_key in cache_expiry:
-                del cache_expiry[cache_key]
+            cache_indexes.pop(cache_key, None)
             logger.debug(f"Cache entry cleared: {cache_key}")
 
     return True
@@ -101,15 +261,28 @@ def get_cache_info():
     """
     Get information about current cache state
 
+    The result stays small regardless of cache size: only a sample of keys
+    (under both "keys" and "keys_sample") and the entries closest to expiry
+    are listed.
+
     Returns:
         dict: Cache information
     """
+    current_time = time.monotonic()
     with cache_lock:
-        current_time = time.time()
-        info = {
-            "entries": len(cache),
-            "keys": list(cache.keys()),
-            "expires_in": {k: int(v - current_time) for k, v in cache_expiry.items()}
-        }
-
-    return info
\ No newline at end of file
+        expiry = {key: entry[0] for key, entry in cache.items()}
+
+    keys = list(itertools.islice(expiry, _CACHE_INFO_SAMPLE))
+    soonest = heapq.nsmallest(_CACHE_INFO_SAMPLE, expiry.items(), key=lambda item: item[1])
+    info = {
+        "entries": len(expiry),
+        "max_entries": CACHE_MAX_ENTRIES,
+        "hits": cache_stats["hits"],
+        "misses": cache_stats["misses"],
+        # "keys" is kept for existing consumers; both hold the same truncated sample
+        "keys": keys,
+        "keys_sample": keys,
+        "expires_in": {k: int(v - current_time) for k, v in soonest}
+    }
+
+    return info
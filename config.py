@@ -3,11 +3,35 @@
 """
 Configuration management for the MagentaTV backend
 """
+import logging
 import os
-import json
+import sys
+import tempfile
+import threading
+from types import MappingProxyType
 
-# Default configuration
-DEFAULT_CONFIG = {
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj, pretty=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+except ImportError:
+    # orjson is optional, fall back to the standard json module
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj, pretty=False):
+        if pretty:
+            return json.dumps(obj, indent=4).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# Default configuration (read-only; use DEFAULT_CONFIG.copy() for a mutable dict)
+DEFAULT_CONFIG = MappingProxyType({
     "USERNAME": "",  # Přihlašovací jméno
     "PASSWORD": "",  # Heslo
     "LANGUAGE": "cz",  # Jazyk ("cz" nebo "sk")
@@ -18,13 +42,27 @@ DEFAULT_CONFIG = {
     "CACHE_TIMEOUT": 3600,  # Platnost cache v sekundách (1 hodina)
     "DATA_DIR": "data",  # Složka pro ukládání dat
     "DEBUG": False  # Debug mód
-}
+})
+
+# Recognized configuration keys
+_ALLOWED_KEYS = frozenset(DEFAULT_CONFIG)
+
+# String settings compared often elsewhere in the backend; interned when loaded
+_INTERNED_KEYS = ("LANGUAGE", "QUALITY", "APP_VERSION", "HOST", "DATA_DIR")
+
+# Parsed config files: absolute path -> ((st_mtime_ns, st_size), configuration)
+_config_cache = {}
+_config_lock = threading.Lock()
 
 
 def load_config(config_file=None):
     """
     Load configuration from file
 
+    The parsed file is memoized and re-read only when its modification time
+    or size changes; concurrent callers wait for a single parse. Each call
+    returns a new dictionary the caller may modify.
+
     Args:
         config_file (str, optional): Path to the configuration file.
                                     If None, tries to load from default location.
@@ -38,21 +76,86 @@ def load_config(config_file=None):
     if config_file is None:
         config_file = os.path.join(config["DATA_DIR"], "config.json")
 
-    # Load config from file if exists
-    if os.path.exists(config_file):
+    path = os.path.abspath(config_file)
+    try:
+        st = os.stat(path)
+    except OSError:
+        # Missing (or inaccessible) file - defaults only
+        return config
+
+    # Unchanged file - reuse the parsed configuration
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1].copy()
+
+    with _config_lock:
+        # Another caller may have parsed the file while we waited
+        cached = _config_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1].copy()
+
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                loaded_config = json.load(f)
+            with open(path, 'rb') as f:
+                # Key the memo by the file actually read, which may differ from the stat above
+                st = os.fstat(f.fileno())
+                stamp = (st.st_mtime_ns, st.st_size)
+                loaded_config = _loads(f.read())
+                if not isinstance(loaded_config, dict):
+                    raise ValueError("configuration must be a JSON object")
                 # Update config with loaded values
                 for key, value in loaded_config.items():
-                    if key.upper() in config:
-                        config[key.upper()] = value
-        except Exception as e:
-            print(f"Error loading config: {e}")
-
+                    key_upper = key.upper()
+                    if key_upper in _ALLOWED_KEYS:
+                        config[key_upper] = value
+            for key in _INTERNED_KEYS:
+                value = config[key]
+                if type(value) is str:
+                    config[key] = sys.intern(value)
+        except FileNotFoundError:
+            # Removed since the stat above
+            return config
+        except (OSError, ValueError) as e:
+            logger.warning(f"Error loading config: {e}")
+            return config
+
+        _config_cache[path] = (stamp, config.copy())
     return config
 
 
+# Drop all memoized config files (e.g. after editing them outside save_config)
+load_config.cache_clear = _config_cache.clear
+
+
+def _write_atomic(path, data):
+    """
+    Write a file so that readers see either the old or the new content
+
+    Args:
+        path (str): Target file path
+        data (bytes): File content
+    """
+    # Unique temporary file in the target directory, so concurrent saves don't collide
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or "."
+    )
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def save_config(config, config_file=None):
     """
     Save configuration to file
@@ -68,17 +171,25 @@ def save_config(config, config_file=None):
         config_file = os.path.join(config["DATA_DIR"], "config.json")
 
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(config_file), exist_ok=True)
-
         # Convert keys to lowercase for storage
         save_config = {k.lower(): v for k, v in config.items()}
 
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(save_config, f, indent=4)
+        # Compact JSON unless debugging, when the file is likely to be read by hand
+        data = _dumps(save_config, pretty=bool(config.get("DEBUG")))
+        try:
+            _write_atomic(config_file, data)
+        except FileNotFoundError:
+            # Create the directory only when it is actually missing
+            directory = os.path.dirname(config_file)
+            if not directory or os.path.isdir(directory):
+                raise
+            os.makedirs(directory, exist_ok=True)
+            _write_atomic(config_file, data)
+        _config_cache.pop(os.path.abspath(config_file), None)
         return True
-    except Exception as e:
-        print(f"Error saving config: {e}")
+    except (OSError, TypeError, ValueError) as e:
+        # TypeError/ValueError: value that cannot be serialized to JSON
+        logger.warning(f"Error saving config: {e}")
         return False
 
 
@@ -96,11 +207,11 @@ def update_config(new_config, config_file=None):
     # Load current config
     config = load_config(config_file)
 
-    # Update config
-    for key, value in new_config.items():
-        key_upper = key.upper()
-        if key_upper in config:
-            config[key_upper] = value
+    # Update config (unknown keys are ignored)
+    config.update({
+        key.upper(): value for key, value in new_config.items()
+        if key.upper() in _ALLOWED_KEYS
+    })
 
     # Save updated config
     save_config(config, config_file)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the concurrent fetch deduplication in get_from_cache
+"""
+import threading
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+import cache
+
+FOLLOWERS = 4
+
+
+class _CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self._waiters_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self._waiters_lock:
+            self.waiters += 1
+        return super().wait(timeout)
+
+
+class _CountingInFlight(cache._InFlight):
+    __slots__ = ()
+    created = []
+
+    def __init__(self):
+        super().__init__()
+        self.event = _CountingEvent()
+        self.created.append(self)
+
+
+class InFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config["CACHE_TIMEOUT"] = 60
+        cache.init_cache()
+        self.addCleanup(cache.init_cache)
+
+        _CountingInFlight.created = []
+        patcher = mock.patch.object(cache, "_InFlight", _CountingInFlight)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.gate = threading.Event()
+        self.calls = 0
+
+    def _run_concurrently(self, fetch):
+        """Start a leader and followers for one key; release the leader once all followers wait"""
+        results = [None] * (FOLLOWERS + 1)
+
+        def call(index):
+            with self.app.app_context():
+                try:
+                    results[index] = cache.get_from_cache("key", fetch)
+                except Exception as e:
+                    results[index] = e
+
+        threads = [threading.Thread(target=call, args=(0,))]
+        threads[0].start()
+        self._wait_for(lambda: self.calls == 1)
+
+        threads += [threading.Thread(target=call, args=(i,)) for i in range(1, FOLLOWERS + 1)]
+        for thread in threads[1:]:
+            thread.start()
+        self._wait_for(lambda: _CountingInFlight.created[0].event.waiters == FOLLOWERS)
+
+        self.gate.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    @staticmethod
+    def _wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for concurrent callers")
+            time.sleep(0.001)
+
+    def test_followers_share_the_leader_result(self):
+        def fetch():
+            self.calls += 1
+            self.gate.wait(5)
+            return {"value": 1}
+
+        results = self._run_concurrently(fetch)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(_CountingInFlight.created), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(cache.cache["key"][1], {"value": 1})
+        self.assertEqual(cache._inflight, {})
+
+    def test_followers_receive_the_leader_error(self):
+        def fetch():
+            self.calls += 1
+            self.gate.wait(5)
+            raise RuntimeError("upstream down")
+
+        results = self._run_concurrently(fetch)
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertNotIn("key", cache.cache)
+        self.assertEqual(cache._inflight, {})
+
+        # The failed fetch is not remembered; the next caller tries again
+        self.gate.set()
+        with self.app.app_context():
+            self.assertEqual(cache.get_from_cache("key", lambda: "ok"), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
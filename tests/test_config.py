@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the configuration file reader and writer
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import config
+
+
+class ConfigFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.addCleanup(config.load_config.cache_clear)
+        self.config_file = os.path.join(self.tmp_dir, "config.json")
+
+    def test_save_then_load_returns_new_values(self):
+        self.assertEqual(config.load_config(self.config_file)["QUALITY"], "p5")
+
+        self.assertTrue(config.save_config({"QUALITY": "p3"}, self.config_file))
+        self.assertEqual(config.load_config(self.config_file)["QUALITY"], "p3")
+
+        config.update_config({"quality": "p1", "unknown": 1}, self.config_file)
+        loaded = config.load_config(self.config_file)
+        self.assertEqual(loaded["QUALITY"], "p1")
+        self.assertNotIn("UNKNOWN", loaded)
+
+    def test_save_creates_missing_directory(self):
+        config_file = os.path.join(self.tmp_dir, "nested", "config.json")
+        self.assertTrue(config.save_config({"PORT": 8080}, config_file))
+        self.assertEqual(config.load_config(config_file)["PORT"], 8080)
+
+    def test_concurrent_saves_leave_a_complete_file(self):
+        def save(port):
+            self.assertTrue(config.save_config({"PORT": port}, self.config_file))
+
+        threads = [threading.Thread(target=save, args=(port,)) for port in range(5000, 5020)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(config.load_config(self.config_file)["PORT"], range(5000, 5020))
+        self.assertEqual(os.listdir(self.tmp_dir), ["config.json"])
+
+    def test_unserializable_value_keeps_previous_file(self):
+        self.assertTrue(config.save_config({"PORT": 8080}, self.config_file))
+        self.assertFalse(config.save_config({"PORT": object()}, self.config_file))
+
+        self.assertEqual(config.load_config(self.config_file)["PORT"], 8080)
+        self.assertEqual(os.listdir(self.tmp_dir), ["config.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
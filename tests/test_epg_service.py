@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the EPG XMLTV export
+"""
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from Services.epg_service import EPGService, _format_xmltv_time
+
+
+class _FakeAuth:
+    session = None
+    language = "cz"
+
+    def get_base_url(self):
+        return "https://czgo.magio.tv"
+
+
+class _FakeChannels:
+    def get_channels(self):
+        return [
+            {"id": 1, "name": "ČT1 & <HD>", "logo": "http://logo/1.png?a=1&b=2"},
+            {"id": 2, "name": "Bez programu", "logo": ""},
+        ]
+
+
+_EPG = {
+    1: [
+        {
+            "start_time": "2026-10-15 20:30:00",
+            "end_time": "2026-10-15 22:05:00",
+            "title": 'Tom & Jerry: "Kočka" <1/2>',
+            "description": "Příběh o kočce & myši",
+            "category": "Animovaný",
+            "year": 1940,
+            "duration": 5700,
+            "images": ["http://img/1.jpg?w=1&h=2"],
+        },
+        {
+            "start_time": "2026-10-15 22:05:00",
+            "end_time": "2026-10-16 00:00:00",
+            "title": "Zprávy",
+        },
+    ],
+    2: [],
+}
+
+
+class EPGExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = EPGService(_FakeAuth())
+        patcher = mock.patch.object(self.service, "get_epg", return_value=_EPG)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _export(self):
+        xml = self.service.export_epg_to_xml("http://server", channel_service=_FakeChannels())
+        self.assertTrue(xml)
+        return xml, ET.fromstring(xml.encode("utf-8"))
+
+    def test_format_xmltv_time(self):
+        self.assertEqual(_format_xmltv_time("2026-10-15 20:30:05"), "20261015203005")
+        self.assertEqual(_format_xmltv_time("2026-01-02 03:04:05"), "20260102030405")
+
+    def test_programme_times(self):
+        _, root = self._export()
+
+        programmes = root.findall("programme")
+        self.assertEqual(
+            [(p.get("start"), p.get("stop")) for p in programmes],
+            [("20261015203000", "20261015220500"), ("20261015220500", "20261016000000")]
+        )
+
+    def test_special_characters_are_escaped(self):
+        xml, root = self._export()
+
+        self.assertIn("Tom &amp; Jerry", xml)
+        self.assertNotIn("<1/2>", xml)
+
+        channels = root.findall("channel")
+        self.assertEqual([c.get("id") for c in channels], ["1"])
+        self.assertEqual(channels[0].findtext("display-name"), "ČT1 & <HD>")
+        self.assertEqual(channels[0].find("icon").get("src"), "http://logo/1.png?a=1&b=2")
+
+        programme = root.find("programme")
+        self.assertEqual(programme.findtext("title"), 'Tom & Jerry: "Kočka" <1/2>')
+        self.assertEqual(programme.findtext("desc"), "Příběh o kočce & myši")
+        self.assertEqual(programme.findtext("date"), "1940")
+        self.assertEqual(programme.find("length").get("units"), "seconds")
+        self.assertEqual(programme.find("icon").get("src"), "http://img/1.jpg?w=1&h=2")
+
+
+if __name__ == "__main__":
+    unittest.main()
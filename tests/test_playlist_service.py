@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for PlaylistService caching
+"""
+import unittest
+from unittest import mock
+
+from Services.channel_service import ChannelService
+from Services.playlist_service import PlaylistService
+
+
+class _FakeAuth:
+    session = None
+    language = "cz"
+
+    def get_base_url(self):
+        return "https://czgo.magio.tv"
+
+
+def _channel_list():
+    # A new list on every call, like ChannelService without a cache_service
+    return [
+        {"id": 1, "name": "CT1 HD", "original_name": "", "logo": "http://logo/1.png",
+         "group": "News", "has_archive": True},
+        {"id": 2, "name": "Nova", "original_name": "", "logo": "",
+         "group": "Movies", "has_archive": False},
+    ]
+
+
+class PlaylistCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.channel_service = ChannelService(_FakeAuth())
+        self.fetch = mock.patch.object(
+            self.channel_service, "_fetch_channels", side_effect=lambda: _channel_list()
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        self.playlist_service = PlaylistService(self.channel_service, stream_service=None)
+
+    def test_second_call_is_served_from_cache(self):
+        with mock.patch.object(
+            PlaylistService, "_render_m3u_playlist", autospec=True,
+            side_effect=PlaylistService._render_m3u_playlist
+        ) as render:
+            first = self.playlist_service.generate_m3u_playlist("http://server")
+            second = self.playlist_service.generate_m3u_playlist("http://server")
+
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertIn("http://server/api/stream/1?redirect=1", first)
+
+    def test_changed_channels_invalidate_cache(self):
+        first = self.playlist_service.generate_m3u_playlist("http://server")
+
+        changed = _channel_list()
+        changed[1]["name"] = "Nova Cinema"
+        self.fetch.side_effect = lambda: changed
+        second = self.playlist_service.generate_m3u_playlist("http://server")
+
+        self.assertNotEqual(first, second)
+        self.assertIn("Nova Cinema", second)
+
+    def test_group_playlists_are_returned_as_copies(self):
+        groups = self.playlist_service.generate_by_groups("http://server")
+        groups["News"] = "modified"
+
+        self.assertNotEqual(self.playlist_service.generate_by_groups("http://server")["News"], "modified")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for ServiceFactory configuration handling
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from Services.config_service import ConfigService
+from Services.factory import ServiceFactory
+from Services.factory import service_factory
+
+
+class FactoryConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.addCleanup(ServiceFactory.clear_instances)
+
+        ServiceFactory.clear_instances()
+        self.config_service = ConfigService(os.path.join(self.tmp_dir, "config.json"))
+        ServiceFactory._default_config = self.config_service
+
+    def test_config_write_replaces_startup_values(self):
+        ServiceFactory.configure({"USERNAME": "old", "QUALITY": "p5"})
+        self.assertEqual(ServiceFactory._get_config_value("USERNAME"), "old")
+
+        self.config_service.set_value("USERNAME", "new")
+        self.assertEqual(ServiceFactory._get_config_value("USERNAME"), "new")
+
+    def test_update_config_clears_memoized_values(self):
+        self.config_service.update_config({"quality": "p3"})
+        self.assertEqual(ServiceFactory._get_config_value("QUALITY", "p5"), "p3")
+
+        self.config_service.update_config({"quality": "p1"})
+        self.assertEqual(ServiceFactory._get_config_value("QUALITY", "p5"), "p1")
+
+    def test_default_client_follows_config(self):
+        self.addCleanup(service_factory.clear_magenta_tv_service)
+        service_factory.clear_magenta_tv_service()
+
+        with mock.patch.object(ServiceFactory, "create_client_service",
+                               side_effect=lambda: object()):
+            first = service_factory.get_magenta_tv_service()
+            self.assertIs(service_factory.get_magenta_tv_service(), first)
+
+            self.config_service.set_value("QUALITY", "p1")
+            second = service_factory.get_magenta_tv_service()
+            self.assertIsNot(second, first)
+
+            service_factory.clear_magenta_tv_service()
+            self.assertIsNot(service_factory.get_magenta_tv_service(), second)
+
+
+class BuildAllTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.addCleanup(ServiceFactory.clear_instances)
+        # SystemService writes its log files relative to the working directory
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_dir)
+
+        ServiceFactory.clear_instances()
+        self.config_service = ConfigService(os.path.join(self.tmp_dir, "config.json"))
+        self.config_service.update_config({"data_dir": os.path.join(self.tmp_dir, "data")})
+
+    def test_build_all_shares_one_graph(self):
+        services = ServiceFactory.build_all(self.config_service)
+
+        self.assertIs(services.config, self.config_service)
+        self.assertIs(services.client.auth_service, services.auth)
+        self.assertIs(services.channel.auth_service, services.auth)
+        self.assertIs(services.playlist.channel_service, services.channel)
+        self.assertIs(ServiceFactory.create_auth_service(config_service=self.config_service), services.auth)
+
+
+if __name__ == "__main__":
+    unittest.main()
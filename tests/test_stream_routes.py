@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the HLS segment prefetch cache
+"""
+import importlib
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_stream_routes():
+    # api/__init__ registers every route module; load only the stream routes
+    saved = {name: sys.modules.get(name) for name in ("api", "api.routes")}
+    try:
+        for name in saved:
+            package = types.ModuleType(name)
+            package.__path__ = [os.path.join(ROOT, *name.split("."))]
+            sys.modules[name] = package
+        return importlib.import_module("api.routes.stream_routes")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+stream_routes = _load_stream_routes()
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.headers = {"Content-Type": "video/mp2t", "Content-Length": str(len(content))}
+
+
+class SegmentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(self._reset)
+        self._reset()
+        self.now = 1000.0
+        patcher = mock.patch.object(stream_routes.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _reset():
+        stream_routes._segment_cache.clear()
+        stream_routes._segment_pending.clear()
+        stream_routes._segment_cache_bytes = 0
+
+    def _prefetch(self, url, content, headers=None, ttl=10):
+        with mock.patch.object(stream_routes._upstream, "get", return_value=_Response(content)):
+            stream_routes._prefetch_segment(url, headers or {}, ttl)
+
+    def test_hit_requires_same_auth_headers(self):
+        auth = {"Authorization": "Bearer a"}
+        self._prefetch("https://cdn/seg1.ts", b"data", auth)
+
+        entry = stream_routes._get_prefetched_segment("https://cdn/seg1.ts", auth)
+        self.assertEqual(entry[1], b"data")
+        self.assertNotIn("Content-Length", entry[2])
+
+        other = {"Authorization": "Bearer b"}
+        self.assertIsNone(stream_routes._get_prefetched_segment("https://cdn/seg1.ts", other))
+        self.assertIsNone(stream_routes._get_prefetched_segment("https://cdn/seg1.ts", {}))
+
+    def test_expired_segment_is_not_served(self):
+        self._prefetch("https://cdn/seg1.ts", b"data", ttl=10)
+        self.now += 11
+        self.assertIsNone(stream_routes._get_prefetched_segment("https://cdn/seg1.ts", {}))
+
+    def test_eviction_keeps_total_size_under_limit(self):
+        with mock.patch.object(stream_routes, "_SEGMENT_CACHE_BYTES", 10):
+            self._prefetch("https://cdn/seg1.ts", b"x" * 4)
+            self._prefetch("https://cdn/seg2.ts", b"x" * 4)
+            self._prefetch("https://cdn/seg3.ts", b"x" * 4)
+            # Larger than the whole cache, never stored
+            self._prefetch("https://cdn/big.ts", b"x" * 11)
+
+        self.assertIsNone(stream_routes._get_prefetched_segment("https://cdn/seg1.ts", {}))
+        self.assertIsNotNone(stream_routes._get_prefetched_segment("https://cdn/seg2.ts", {}))
+        self.assertIsNotNone(stream_routes._get_prefetched_segment("https://cdn/seg3.ts", {}))
+        self.assertIsNone(stream_routes._get_prefetched_segment("https://cdn/big.ts", {}))
+        self.assertEqual(stream_routes._segment_cache_bytes, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
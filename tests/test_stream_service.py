@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the StreamService live stream cache
+"""
+import time
+import unittest
+from unittest import mock
+
+from Services import stream_service
+from Services.stream_service import StreamService
+
+
+class _FakeAuth:
+    session = None
+    language = "cz"
+    device_name = "Android TV"
+    device_type = "OTT_STB"
+    user_agent = "test"
+
+    def __init__(self):
+        self.access_token = "first"
+        self.token_expires = time.time() + 3600
+
+    def get_base_url(self):
+        return "https://czgo.magio.tv"
+
+    def refresh_access_token(self):
+        return True
+
+    def get_auth_headers(self):
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+class StreamCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = _FakeAuth()
+        self.service = StreamService(self.auth)
+        self.now = 1000.0
+        mock.patch.object(stream_service.time, "monotonic", lambda: self.now).start()
+        self.fetch = mock.patch.object(
+            self.service, "_fetch_live_stream", side_effect=self._fetch
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _fetch(self, channel_id):
+        _, redirect_headers = self.service._auth_snapshot()
+        return {"url": f"https://cdn/{channel_id}.m3u8", "headers": redirect_headers}
+
+    def test_cached_until_ttl_expires(self):
+        first = self.service.get_live_stream(1)
+        first["headers"]["Authorization"] = "changed by caller"
+
+        self.now += stream_service._STREAM_CACHE_TTL - 1
+        self.assertEqual(self.service.get_live_stream(1)["headers"]["Authorization"], "Bearer first")
+        self.assertEqual(self.fetch.call_count, 1)
+
+        self.now += 1
+        self.service.get_live_stream(1)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_full_cache_drops_expired_entries_first(self):
+        with mock.patch.object(stream_service, "_STREAM_CACHE_SIZE", 3):
+            self.service.get_live_stream(1)
+            self.now += stream_service._STREAM_CACHE_TTL
+            self.service.get_live_stream(2)
+            self.service.get_live_stream(3)
+            self.service.get_live_stream(4)
+
+        self.assertEqual(set(self.service._stream_cache), {2, 3, 4})
+
+    def test_token_change_drops_cached_streams(self):
+        self.service.get_live_stream(1)
+        self.service.get_live_stream(2)
+
+        self.auth.access_token = "second"
+        stream = self.service.get_live_stream(1)
+        self.assertEqual(stream["headers"]["Authorization"], "Bearer second")
+        self.assertEqual(self.fetch.call_count, 3)
+
+        self.service.get_live_stream(2)
+        self.assertEqual(self.fetch.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()